@@ -0,0 +1,142 @@
+"""
+Per-tick cost of the vectorized EnemyField versus the original one-object-per-
+tank update loop, for growing tank counts; "with LOD" lets far tanks move at
+a reduced rate (EnemyField's level of detail). The last column is a whole
+Simulation.step with that many tanks and the player firing, so costs outside
+the field's own update (collisions, spawning) show up too.
+
+Run from the repository root:  python -m benchmarks.bench_enemies
+"""
+import math
+import random
+import time
+
+import pygame
+
+from game.enemy import EnemyField, TankBullet
+from game.headless import autopilot
+from game.simulation import Simulation
+
+class LegacyTank:
+    # The original EnemyTank state and update(), plain attributes only
+    def __init__(self, x, y, rng):
+        self.rng = rng
+        self.width = 60
+        self.height = 32
+        self.turret_length = 38
+        self.world_x = x
+        self.world_y = y
+        self.turret_angle = 0
+        self.speed = 3.2
+        self.fire_cooldown = 0
+        self.bullets = []
+        self.max_bullets = 1
+        self.bullet_speed = 14
+        self.bullet_cooldown_time = rng.randint(90, 180)
+        self.pause_time = 0
+        self.paused = False
+        self.exploding = False
+        self.explode_timer = 0
+
+    def update(self, player_world_x, player_world_y, screen_width=1920, screen_height=1080):
+        if self.exploding:
+            self.explode_timer -= 1
+            if self.explode_timer <= 0:
+                return 'remove'
+            return None
+        if self.paused:
+            self.pause_time -= 1
+            if self.pause_time <= 0:
+                self.paused = False
+            return None
+        dx = player_world_x - self.world_x
+        dy = player_world_y - self.world_y
+        dist = math.hypot(dx, dy)
+        edge_dist = max(screen_width, screen_height) * 0.48
+        preferred_dist = edge_dist * 0.92
+        if dist > preferred_dist:
+            move_angle = math.atan2(dy, dx)
+            self.world_x += math.cos(move_angle) * self.speed
+            self.world_y += math.sin(move_angle) * self.speed
+        else:
+            tangent_angle = math.atan2(dy, dx) + math.pi / 2
+            self.world_x += math.cos(tangent_angle) * self.speed * 0.7
+            self.world_y += math.sin(tangent_angle) * self.speed * 0.7
+        self.turret_angle = math.degrees(math.atan2(dy, dx))
+        if self.fire_cooldown > 0:
+            self.fire_cooldown -= 1
+        elif dist < edge_dist * 1.05 and len(self.bullets) < self.max_bullets:
+            rad = math.radians(self.turret_angle)
+            bx = self.world_x + math.cos(rad) * (self.width // 2 + self.turret_length // 2)
+            by = self.world_y + math.sin(rad) * (self.height // 2 + self.turret_length // 2)
+            self.bullets.append(TankBullet(bx, by, self.turret_angle, self.bullet_speed))
+            self.bullet_cooldown_time = self.rng.randint(90, 180)
+            self.fire_cooldown = self.bullet_cooldown_time
+        for bullet in self.bullets[:]:
+            bullet.update()
+            if bullet.lifetime <= 0:
+                self.bullets.remove(bullet)
+        return None
+
+def spawn_positions(count, seed=0):
+    # Tanks scattered around the player, from point blank to far off radar
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        dist = rng.uniform(300, 8000)
+        positions.append((math.cos(angle) * dist, math.sin(angle) * dist))
+    return positions
+
+def run_legacy(positions, ticks):
+    rng = random.Random(1)
+    tanks = [LegacyTank(x, y, rng) for x, y in positions]
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for tank in tanks[:]:
+            if tank.update(tick * 2.0, 0.0) == 'remove':
+                tanks.remove(tank)
+    return (time.perf_counter() - start) / ticks
+
+def run_field(positions, ticks, lod_interval=1):
+    field = EnemyField(rng=random.Random(1), lod_interval=lod_interval)
+    for x, y in positions:
+        tank = field.spawn(0, 0)
+        tank.world_x = x
+        tank.world_y = y
+    start = time.perf_counter()
+    for tick in range(ticks):
+        field.step(tick * 2.0, 0.0)
+    return (time.perf_counter() - start) / ticks
+
+def run_simulation(positions, ticks):
+    # The tanks in a seeded round, flown and fired by the headless autopilot;
+    # the player can't die, so every tick does the full work
+    sim = Simulation(1280, 720, seed=1, max_tanks=len(positions) + 1)
+    for position in positions:
+        sim.enemies.spawn(0, 0, position=position)
+    inputs = autopilot()
+    elapsed = 0.0
+    for tick in range(ticks):
+        sim.hearts = sim.max_hearts
+        tick_input = next(inputs)
+        start = time.perf_counter()
+        sim.step(tick_input)
+        elapsed += time.perf_counter() - start
+    sim.release()
+    return elapsed / ticks
+
+def main(counts=(10, 100, 1000, 10000), ticks=200):
+    pygame.display.init()
+    print(f"{'tanks':>8}{'legacy ms/tick':>16}{'field ms/tick':>16}{'speedup':>10}{'with LOD':>10}{'sim step':>10}")
+    for count in counts:
+        positions = spawn_positions(count)
+        n = max(10, ticks * 100 // count)  # Fewer ticks for the big fields
+        before = run_legacy(positions, n) * 1000
+        after = run_field(positions, n) * 1000
+        lod = run_field(positions, n, lod_interval=4) * 1000
+        step = run_simulation(positions, n) * 1000
+        print(f"{count:>8}{before:>16.3f}{after:>16.3f}{before / after:>9.1f}x{lod:>10.3f}{step:>10.3f}")
+
+if __name__ == "__main__":
+    main()
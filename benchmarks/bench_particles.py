@@ -0,0 +1,70 @@
+"""
+Per-frame update + draw cost of the NumPy ParticleSystem versus the original
+list-of-dicts sparks, for growing particle counts.
+
+Run from the repository root:  python -m benchmarks.bench_particles
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+import time
+
+import numpy as np
+import pygame
+
+from game.particles import ParticleSystem, render_circle
+
+WIDTH, HEIGHT = 1280, 720
+
+def legacy_sparks(count):
+    return [{
+        'x': random.uniform(-WIDTH, WIDTH), 'y': random.uniform(-HEIGHT, HEIGHT),
+        'vx': random.uniform(-8, 8), 'vy': random.uniform(-13, 0),
+        'life': random.randint(10, 18),
+        'color': (255, random.randint(180, 220), 60),
+    } for _ in range(count)]
+
+def run_legacy(screen, count, frames):
+    # The old main.run loop: draw, move and remove each spark dict in turn
+    sparks = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        if len(sparks) < count:
+            sparks.extend(legacy_sparks(count - len(sparks)))
+        for spark in sparks[:]:
+            sx = int(spark['x'] + WIDTH // 2)
+            sy = int(spark['y'] + HEIGHT // 2)
+            pygame.draw.circle(screen, spark['color'], (sx, sy), 3)
+            spark['x'] += spark['vx']
+            spark['y'] += spark['vy']
+            spark['vy'] += 1.2
+            spark['life'] -= 1
+            if spark['life'] <= 0:
+                sparks.remove(spark)
+    return (time.perf_counter() - start) / frames
+
+def run_system(screen, count, frames):
+    sparks = ParticleSystem([render_circle(3, (255, g, 60)) for g in range(180, 221)], capacity=count, gravity=1.2)
+    start = time.perf_counter()
+    for _ in range(frames):
+        sparks.update()
+        missing = count - len(sparks)
+        if missing:
+            sparks.emit(np.random.uniform(-WIDTH, WIDTH, missing), np.random.uniform(-HEIGHT, HEIGHT, missing),
+                        np.random.uniform(-8, 8, missing), np.random.uniform(-13, 0, missing),
+                        life=np.random.randint(10, 19, missing), frame=np.random.randint(0, 41, missing))
+        sparks.draw(screen, 0, 0, WIDTH, HEIGHT)
+    return (time.perf_counter() - start) / frames
+
+def main(counts=(12, 120, 1200, 12000), frames=120):
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"{'sparks':>8}{'legacy ms/frame':>17}{'system ms/frame':>17}{'speedup':>10}")
+    for count in counts:
+        before = run_legacy(screen, count, frames) * 1000
+        after = run_system(screen, count, frames) * 1000
+        print(f"{count:>8}{before:>17.3f}{after:>17.3f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of replacing the tanks of a kill streak: the original spawning, which
+placed both replacements of every kill on the tick of the hit and checked
+each try against every tank, versus the SpawnDirector, which spreads them
+over the following ticks and checks tries on a grid. Reports the worst tick.
+
+Run from the repository root:  python -m benchmarks.bench_spawn
+"""
+import math
+import random
+import time
+
+from game.enemy import EnemyField
+from game.spawn import SpawnDirector
+
+RADAR_RADIUS = 3600
+SEPARATION = 300
+
+def make_field(count, seed=0):
+    # Tanks waiting in the spawn ring around the player (where earlier
+    # replacements sit paused), the crowded case for picking a spot
+    field = EnemyField(rng=random.Random(seed))
+    rng = random.Random(seed)
+    for _ in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        dist = RADAR_RADIUS + 200 + rng.uniform(0, 200)
+        field.spawn(0, 0, position=(math.cos(angle) * dist, math.sin(angle) * dist))
+    return field
+
+def legacy_spawn(field, avoid_positions):
+    # The original EnemyTank placement: up to 20 random spots on the ring,
+    # each checked against every position in avoid_positions
+    rng = field.rng
+    dist = RADAR_RADIUS + 200 + rng.uniform(0, 200)
+    for _ in range(20):
+        angle = rng.uniform(0, 2 * math.pi)
+        candidate_x = math.cos(angle) * dist
+        candidate_y = math.sin(angle) * dist
+        if all(math.hypot(candidate_x - x, candidate_y - y) > SEPARATION for (x, y) in avoid_positions):
+            break
+    return field.spawn(0, 0, position=(candidate_x, candidate_y))
+
+def run_legacy(count, kills):
+    # Every kill on one tick: avoid list rebuilt per kill, two tanks each
+    field = make_field(count)
+    start = time.perf_counter()
+    for _ in range(kills):
+        xs, ys = field.positions()
+        avoid_positions = [(0.0, 0.0)] + list(zip(xs.tolist(), ys.tolist()))
+        for _ in range(2):
+            tank = legacy_spawn(field, avoid_positions)
+            avoid_positions.append((tank.world_x, tank.world_y))
+    return time.perf_counter() - start
+
+def run_director(count, kills):
+    field = make_field(count)
+    director = SpawnDirector(field, max_tanks=count + 2 * kills, radar_radius=RADAR_RADIUS, separation=SEPARATION)
+    director.request(2 * kills)
+    worst = 0.0
+    ticks = 0
+    while director.pending:
+        start = time.perf_counter()
+        director.step(0.0, 0.0)
+        worst = max(worst, time.perf_counter() - start)
+        ticks += 1
+    return worst, ticks
+
+def main(counts=(10, 50, 200, 1000), kills=8, repeat=3):
+    make_field(1)  # Renders the tank image once, outside the timings
+    print(f"{kills} kills on one tick, worst tick spent spawning (best of {repeat})")
+    print(f"{'tanks':>8}{'legacy ms':>12}{'director ms':>14}{'over ticks':>12}")
+    for count in counts:
+        before = min(run_legacy(count, kills) for _ in range(repeat))
+        after, ticks = min(run_director(count, kills) for _ in range(repeat))
+        print(f"{count:>8}{before * 1000:>12.3f}{after * 1000:>14.3f}{ticks:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare the vectorized sound generators in game.synth / game.enemy against the
+original per-whump loop implementations. The baked asset cache is bypassed, so
+this measures synthesis only.
+
+Run from the repository root:  python -m benchmarks.bench_synth
+"""
+import os
+import timeit
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from game import enemy, synth
+
+# --- Original implementations, kept here only as a baseline ---
+
+def legacy_to_sound(wave, volume):
+    wave = (wave * 32767 * volume).astype(np.int16)
+    if wave.ndim == 1:
+        wave = np.column_stack((wave, wave))
+    return pygame.sndarray.make_sound(wave)
+
+def legacy_whump(whumps_per_sec, base_freq, volume, duration=1.0, sample_rate=44100):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    pulse = np.zeros_like(t)
+    whump_interval = int(sample_rate / whumps_per_sec)
+    for i in range(0, len(t), whump_interval):
+        whump_len = int(sample_rate * 0.07)
+        end = min(i + whump_len, len(t))
+        envelope = np.exp(-np.linspace(0, 3, end - i))
+        whump = 0.7 * np.sin(2 * np.pi * base_freq * t[i:end])
+        whump += 0.3 * np.random.normal(0, 0.7, end - i)
+        whump *= envelope
+        pulse[i:end] += whump
+    pulse = pulse / (np.max(np.abs(pulse)) + 1e-6)
+    return legacy_to_sound(pulse, volume)
+
+def legacy_bullet_fire(duration=0.18, freq=180, sample_rate=44100, volume=0.7):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    envelope = np.exp(-8 * t)
+    wave = 0.7 * np.sin(2 * np.pi * freq * t) * envelope
+    wave += 0.3 * np.random.normal(0, 0.7, t.shape) * envelope
+    return legacy_to_sound(wave, volume)
+
+def legacy_explosion(duration=0.3, sample_rate=44100, volume=0.5):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    wave = np.random.normal(0, 1, t.shape) * np.exp(-5 * t)
+    return legacy_to_sound(wave, volume)
+
+def legacy_crash(duration=0.5, sample_rate=44100, volume=0.7):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    noise = np.random.normal(0, 1, t.shape)
+    envelope = np.exp(-6 * t)
+    thud = 0.7 * np.sin(2 * np.pi * 60 * t) * np.exp(-12 * t)
+    wave = (noise * 0.5 + thud) * envelope
+    return legacy_to_sound(wave, volume)
+
+def legacy_damage(duration=0.22, freq=110, sample_rate=44100, volume=0.55):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    envelope = np.exp(-7 * t)
+    wave = 0.6 * np.sin(2 * np.pi * freq * t) * envelope
+    wave += 0.5 * np.random.normal(0, 0.7, t.shape) * envelope * (1 - t / duration)
+    wave += 0.2 * np.sin(2 * np.pi * (freq * 2.7) * t) * envelope * (1 - t / duration)
+    return legacy_to_sound(wave, volume)
+
+def legacy_tank_fire(duration=0.22, freq=60, sample_rate=44100, volume=0.7):
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    envelope = np.exp(-5 * t)
+    wave = 0.7 * np.sin(2 * np.pi * freq * t) * envelope
+    wave += 0.3 * np.random.normal(0, 0.5, t.shape) * envelope
+    return legacy_to_sound(wave, volume)
+
+def current_whump(whumps_per_sec, base_freq, volume):
+    return synth.make_sound(synth.whump_train(1.0, whumps_per_sec, base_freq, volume))
+
+CASES = [
+    ("rotor whump (5/s)", lambda: legacy_whump(5, 38, 0.18), lambda: current_whump(5, 38, 0.18)),
+    ("engine whump (3/s)", lambda: legacy_whump(3, 60, 0.25), lambda: current_whump(3, 60, 0.25)),
+    ("rotor bank (25 loops)",
+     lambda: [legacy_whump(5, 38 * (0.7 + i * 0.025), 0.18) for i in range(25)],
+     lambda: [current_whump(5, 38 * (0.7 + i * 0.025), 0.18) for i in range(25)]),
+    ("bullet fire", legacy_bullet_fire, lambda: synth.make_sound(enemy.bullet_fire_samples())),
+    ("explosion", legacy_explosion, lambda: synth.make_sound(enemy.explosion_samples())),
+    ("crash", legacy_crash, lambda: synth.make_sound(enemy.crash_samples())),
+    ("damage", legacy_damage, lambda: synth.make_sound(enemy.damage_samples())),
+    ("tank fire", legacy_tank_fire, lambda: synth.make_sound(enemy.tank_fire_samples())),
+]
+
+def best_ms(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+def main(number=20):
+    pygame.mixer.init(44100, -16, 2)
+    print(f"{'generator':<24}{'legacy ms':>12}{'vectorized ms':>16}{'speedup':>10}")
+    for name, legacy, current in CASES:
+        before = best_ms(legacy, number)
+        after = best_ms(current, number)
+        print(f"{name:<24}{before:>12.3f}{after:>16.3f}{before / after:>9.2f}x")
+    pygame.mixer.quit()
+
+if __name__ == "__main__":
+    main()
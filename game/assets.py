@@ -0,0 +1,96 @@
+import hashlib
+import inspect
+import os
+import tempfile
+import numpy as np
+import pygame
+from .settings import CONFIG_DIR
+
+# Baked procedural assets. Each generator call is keyed by the generator's
+# name, its keyword arguments and a hash of its source (plus the shared synth
+# code), so editing a generator invalidates its files automatically. Sample
+# buffers are stored as .npy and memory-mapped back; sprites as PNG. Results
+# are also kept in memory, so later rounds don't even touch the disk.
+#
+# Cached sounds and surfaces are shared: callers must not draw on them.
+
+CACHE_DIR = CONFIG_DIR / "cache"
+
+_versions = {}
+_sounds = {}
+_images = {}
+
+def _code_version(func):
+    version = _versions.get(func)
+    if version is None:
+        from . import synth
+        try:
+            source = inspect.getsource(func) + inspect.getsource(synth)
+        except (OSError, TypeError):
+            source = func.__code__.co_code.hex()
+        version = hashlib.sha1(source.encode()).hexdigest()
+        _versions[func] = version
+    return version
+
+def cache_path(func, params, suffix):
+    key = f"{func.__module__}.{func.__qualname__}:{sorted(params.items())!r}:{_code_version(func)}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:20]
+    return CACHE_DIR / f"{func.__name__}-{digest}{suffix}"
+
+def _write_atomic(path, write):
+    # Write to a temp file and rename, so a crash never leaves half a file.
+    # Every writer gets its own temp file, even two threads baking one asset
+    tmp = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            write(f)
+        os.replace(tmp, path)
+    except OSError:
+        # Read-only or full disk: just don't cache
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+def for_display(surface, alpha=True):
+    # surface in the display's pixel format (with per-pixel alpha unless
+    # alpha is False), so blits need no conversion; as is without a display
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+def cached_samples(func, **params):
+    # int16 sample buffer from func(**params), memory-mapped from disk when baked
+    path = cache_path(func, params, ".npy")
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        samples = func(**params)
+        _write_atomic(path, lambda f: np.save(f, samples))
+        return samples
+
+def cached_sound(func, **params):
+    key = (func, tuple(sorted(params.items())))
+    sound = _sounds.get(key)
+    if sound is None:
+        from . import synth
+        sound = synth.make_sound(cached_samples(func, **params))
+        _sounds[key] = sound
+    return sound
+
+def cached_image(func, **params):
+    # Surface from func(**params), loaded from a baked PNG when available
+    key = (func, tuple(sorted(params.items())))
+    image = _images.get(key)
+    if image is None:
+        path = cache_path(func, params, ".png")
+        try:
+            image = pygame.image.load(str(path))
+        except (OSError, pygame.error):
+            image = func(**params)
+            _write_atomic(path, lambda f: pygame.image.save(image, f, path.name))
+        image = _images[key] = for_display(image)
+    return image
@@ -0,0 +1,87 @@
+from collections import namedtuple
+import math
+import pygame
+
+SoundKind = namedtuple('SoundKind', 'sound priority max_voices volume positional')
+
+class SoundScheduler:
+    """
+    One-shot sound effects on a fixed pool of mixer channels. The first
+    reserved channels are kept out of the pool for looping sounds (the
+    rotor), so effects can never take them.
+
+    trigger() only queues a sound; flush() plays what was queued once per
+    frame: one voice per kind however often it was triggered (the loudest,
+    i.e. nearest, trigger wins), quieter with distance from the listener,
+    no more than max_voices of a kind at once (the oldest is cut off). When
+    the pool is full a sound takes the oldest voice of a lower priority or
+    is dropped.
+    """
+    def __init__(self, channels=16, reserved=2, rolloff=500, hearing_range=2600, min_volume=0.05):
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(reserved)
+        self.reserved = [pygame.mixer.Channel(i) for i in range(reserved)]
+        self.pool = [pygame.mixer.Channel(i) for i in range(reserved, channels)]
+        self.rolloff = rolloff  # Full volume within this distance, then 1/distance
+        self.hearing_range = hearing_range  # Silent beyond this distance
+        self.min_volume = min_volume  # Quieter sounds aren't worth a voice
+        self.kinds = {}
+        self.voices = [None] * len(self.pool)  # (kind, priority, started) per pool channel
+        self.pending = {}  # kind -> positions it was triggered at since the last flush
+        self.started = 0  # Voice counter, to tell old voices from new
+
+    def add(self, name, sound, priority=1, max_voices=2, volume=1.0, positional=True):
+        self.kinds[name] = SoundKind(sound, priority, max_voices, volume, positional)
+
+    def trigger(self, name, x=0.0, y=0.0):
+        # Queue a sound at world position x, y (ignored for non-positional kinds)
+        if name in self.kinds:
+            self.pending.setdefault(name, []).append((x, y))
+
+    def attenuation(self, distance):
+        if distance >= self.hearing_range:
+            return 0.0
+        return min(1.0, self.rolloff / max(distance, 1.0))
+
+    def flush(self, listener_x=0.0, listener_y=0.0):
+        """Play the sounds triggered since the last flush, as heard from listener_x, listener_y."""
+        if not self.pending:
+            return
+        pending = sorted(self.pending.items(), key=lambda item: -self.kinds[item[0]].priority)
+        self.pending = {}
+        busy = [channel.get_busy() for channel in self.pool]
+        for name, positions in pending:
+            kind = self.kinds[name]
+            volume = kind.volume
+            if kind.positional:
+                nearest = min(math.hypot(x - listener_x, y - listener_y) for x, y in positions)
+                volume *= self.attenuation(nearest)
+            if volume < self.min_volume:
+                continue
+            slot = self._find_voice(name, kind, busy)
+            if slot is None:
+                continue  # Dropped: everything playing matters more
+            channel = self.pool[slot]
+            channel.play(kind.sound)
+            channel.set_volume(volume)
+            self.voices[slot] = (name, kind.priority, self.started)
+            self.started += 1
+            busy[slot] = True
+
+    def _find_voice(self, name, kind, busy):
+        # Pool slot for a new voice of kind, or None to drop it
+        own = [slot for slot, voice in enumerate(self.voices) if busy[slot] and voice[0] == name]
+        if len(own) >= kind.max_voices:
+            return min(own, key=lambda slot: self.voices[slot][2])
+        for slot, playing in enumerate(busy):
+            if not playing:
+                return slot
+        lower = [slot for slot, voice in enumerate(self.voices) if voice[1] < kind.priority]
+        if lower:
+            return min(lower, key=lambda slot: (self.voices[slot][1], self.voices[slot][2]))
+        return None
+
+    def stop(self):
+        self.pending = {}
+        for channel in self.pool:
+            channel.stop()
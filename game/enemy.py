@@ -1,110 +1,130 @@
 import pygame
 import random
+import time
 import numpy as np
 import math
+from . import synth
+from .assets import cached_sound, cached_image, for_display
+from .particles import render_circle
+from .snapshot import SpriteSnapshot
 
-def generate_rotor_sound(rotor_speed_func, volume=0.18, sample_rate=44100):
-    # Returns a function that manages a looping rotor sound, updating pitch with rotor_speed_func
+def generate_rotor_sound(rotor_speed_func, volume=0.18, sample_rate=44100, fps=60, pitch_range=(0.7, 1.3), pitch_step=0.025, crossfade_ms=60, channels=None):
+    # Returns an object that manages a looping rotor sound. Every pitch in
+    # pitch_range is synthesized up front into a bank of loops, so pitch
+    # changes just crossfade to another loop instead of resynthesizing.
+    # channels: two mixer channels to crossfade between (e.g. reserved ones);
+    # by default any free channel is used. Loops switch at most once per
+    # crossfade, so a fade always finishes before its channel is reused.
     class RotorSound:
         def __init__(self):
             self.sample_rate = sample_rate
             self.duration = 1.0
             self.volume = volume
+            self.fps = fps
+            low, high = pitch_range
+            self.pitch_levels = [low + i * pitch_step for i in range(int(round((high - low) / pitch_step)) + 1)]
+            self.bank = None
+            self.level = None
             self.sound = None
             self.channel = None
             self.last_rate = None
             self.last_pitch = None
+            self.switched = 0.0  # When the latest crossfade started
         def set_volume(self, v):
             self.volume = v
             if self.channel:
                 self.channel.set_volume(v)
         def _generate_whump(self, whumps_per_sec, pitch_shift=1.0):
-            t = np.linspace(0, self.duration, int(self.sample_rate * self.duration), False)
-            pulse = np.zeros_like(t)
-            whump_interval = int(self.sample_rate / whumps_per_sec)
             base_freq = 38 * pitch_shift  # Lower base frequency for lower pitch
-            for i in range(0, len(t), whump_interval):
-                whump_len = int(self.sample_rate * 0.07)
-                end = min(i + whump_len, len(t))
-                envelope = np.exp(-np.linspace(0, 3, end - i))
-                whump = 0.7 * np.sin(2 * np.pi * base_freq * t[i:end])
-                whump += 0.3 * np.random.normal(0, 0.7, end - i)
-                whump *= envelope
-                pulse[i:end] += whump
-            pulse = pulse / (np.max(np.abs(pulse)) + 1e-6)
-            pulse = (pulse * 32767 * self.volume).astype(np.int16)
-            if pulse.ndim == 1:
-                pulse = np.column_stack((pulse, pulse))
-            sound = pygame.sndarray.make_sound(pulse)
+            sound = cached_sound(synth.whump_train, duration=self.duration, whumps_per_sec=whumps_per_sec,
+                                 freq=base_freq, volume=self.volume, sample_rate=self.sample_rate)
             sound.set_volume(self.volume)
             return sound
+        def _build_bank(self, whumps_per_sec):
+            # The whump rate saturates at its cap for any real rotor speed, so
+            # one bank per play() covers the whole flight envelope
+            self.bank = [self._generate_whump(whumps_per_sec, p) for p in self.pitch_levels]
+            self.last_rate = whumps_per_sec
+        def _nearest_level(self, pitch_shift):
+            level = int(round((pitch_shift - self.pitch_levels[0]) / pitch_step))
+            return max(0, min(len(self.pitch_levels) - 1, level))
+        def _crossfade_to(self, level):
+            old_channel = self.channel
+            self.sound = self.bank[level]
+            fade_ms = crossfade_ms if old_channel else 0
+            if old_channel:
+                old_channel.fadeout(crossfade_ms)
+            if channels:
+                self.channel = channels[1] if old_channel is channels[0] else channels[0]
+                self.channel.play(self.sound, loops=-1, fade_ms=fade_ms)
+            else:
+                self.channel = self.sound.play(loops=-1, fade_ms=fade_ms)
+            if self.channel:
+                self.channel.set_volume(self.volume)
+            self.level = level
+            self.switched = time.perf_counter()
         def play(self):
             whumps_per_sec, pitch_shift = self._calc_whumps_and_pitch()
-            self.sound = self._generate_whump(whumps_per_sec, pitch_shift)
-            self.channel = self.sound.play(loops=-1)
-            self.last_rate = whumps_per_sec
+            if self.bank is None or abs(whumps_per_sec - self.last_rate) > 0.1:
+                self._build_bank(whumps_per_sec)
+            if self.last_pitch is not None:
+                pitch_shift = self.last_pitch
+            self.stop()
+            self._crossfade_to(self._nearest_level(pitch_shift))
             self.last_pitch = pitch_shift
         def update(self):
-            whumps_per_sec, pitch_shift = self._calc_whumps_and_pitch()
-            if (abs(whumps_per_sec - (self.last_rate or 0)) > 0.1) or (abs(pitch_shift - (self.last_pitch or 1.0)) > 0.01):
-                if self.channel:
-                    self.channel.stop()
-                self.sound = self._generate_whump(whumps_per_sec, pitch_shift)
-                self.channel = self.sound.play(loops=-1)
-                self.last_rate = whumps_per_sec
-                self.last_pitch = pitch_shift
+            _, pitch_shift = self._calc_whumps_and_pitch()
+            self.set_pitch(pitch_shift)
         def stop(self):
             if self.channel:
                 self.channel.stop()
                 self.channel = None
         def _calc_whumps_and_pitch(self):
             rotor_speed = rotor_speed_func()  # deg/frame
-            fps = 60
-            revs_per_sec = (rotor_speed * fps) / 360.0
+            revs_per_sec = (rotor_speed * self.fps) / 360.0
             whumps_per_sec = max(1.0, min(5, revs_per_sec * 2.2))  # Lower whump rate for lower pitch
             pitch_shift = 0.7 + 0.18 * ((whumps_per_sec - 1.0) / (5 - 1.0))  # Lower pitch overall
             return whumps_per_sec, pitch_shift
         def set_pitch(self, pitch_shift):
-            whumps_per_sec, _ = self._calc_whumps_and_pitch()
-            if (abs(pitch_shift - (self.last_pitch or 1.0)) > 0.01):
-                if self.channel:
-                    self.channel.stop()
-                self.sound = self._generate_whump(whumps_per_sec, pitch_shift)
-                self.channel = self.sound.play(loops=-1)
-                self.last_pitch = pitch_shift
+            # Never synthesizes: pick the nearest pre-built loop and crossfade
+            self.last_pitch = pitch_shift
+            if self.channel is None:
+                return
+            level = self._nearest_level(pitch_shift)
+            # Still fading: the next call after the fade picks the latest pitch
+            if level != self.level and time.perf_counter() - self.switched >= crossfade_ms / 1000:
+                self._crossfade_to(level)
     return RotorSound()
 
+def bullet_fire_samples(duration=0.18, freq=180, sample_rate=44100, volume=0.7, rng=None):
+    t = synth.time_axis(duration, sample_rate)
+    wave = 0.7 * np.sin(2 * np.pi * freq * t)
+    wave += 0.3 * synth.noise(0.7, t.shape, rng)
+    wave *= np.exp(-8 * t)
+    return synth.to_stereo_int16(wave, volume)
+
 def generate_bullet_fire_sound(duration=0.18, freq=180, sample_rate=44100, volume=0.7):
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    envelope = np.exp(-8 * t)
-    wave = 0.7 * np.sin(2 * np.pi * freq * t) * envelope
-    wave += 0.3 * np.random.normal(0, 0.7, t.shape) * envelope
-    wave = (wave * 32767 * volume).astype(np.int16)
-    if wave.ndim == 1:
-        wave = np.column_stack((wave, wave))
-    return pygame.sndarray.make_sound(wave)
+    return cached_sound(bullet_fire_samples, duration=duration, freq=freq, sample_rate=sample_rate, volume=volume)
+
+def explosion_samples(duration=0.3, sample_rate=44100, volume=0.5, rng=None):
+    t = synth.time_axis(duration, sample_rate)
+    wave = synth.noise(1, t.shape, rng)
+    wave *= np.exp(-5 * t)
+    return synth.to_stereo_int16(wave, volume)
 
 def generate_explosion_sound(duration=0.3, sample_rate=44100, volume=0.5):
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    noise = np.random.normal(0, 1, t.shape)
-    envelope = np.exp(-5 * t)
-    wave = noise * envelope
-    wave = (wave * 32767 * volume).astype(np.int16)
-    if wave.ndim == 1:
-        wave = np.column_stack((wave, wave))
-    return pygame.sndarray.make_sound(wave)
+    return cached_sound(explosion_samples, duration=duration, sample_rate=sample_rate, volume=volume)
 
-def generate_crash_sound(duration=0.5, sample_rate=44100, volume=0.7):
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
+def crash_samples(duration=0.5, sample_rate=44100, volume=0.7, rng=None):
+    t = synth.time_axis(duration, sample_rate)
     # A low, noisy thud with a sharp attack and slow decay
-    noise = np.random.normal(0, 1, t.shape)
-    envelope = np.exp(-6 * t)
-    thud = 0.7 * np.sin(2 * np.pi * 60 * t) * np.exp(-12 * t)
-    wave = (noise * 0.5 + thud) * envelope
-    wave = (wave * 32767 * volume).astype(np.int16)
-    if wave.ndim == 1:
-        wave = np.column_stack((wave, wave))
-    return pygame.sndarray.make_sound(wave)
+    wave = 0.5 * synth.noise(1, t.shape, rng)
+    wave += 0.7 * np.sin(2 * np.pi * 60 * t) * np.exp(-12 * t)
+    wave *= np.exp(-6 * t)
+    return synth.to_stereo_int16(wave, volume)
+
+def generate_crash_sound(duration=0.5, sample_rate=44100, volume=0.7):
+    return cached_sound(crash_samples, duration=duration, sample_rate=sample_rate, volume=volume)
 
 class EngineSound:
     def __init__(self, base_bpm=120, volume=0.25, duration=1.0, sample_rate=44100):
@@ -120,26 +140,8 @@ class EngineSound:
     def _generate_whump(self, bpm):
         # Whump: repeating low-passed thump (3-5 per second)
         whump_freq = bpm / 60.0  # whumps per second
-        t = np.linspace(0, self.duration, int(self.sample_rate * self.duration), False)
-        # Make a pulse train: 1 for whump, 0 otherwise
-        pulse = np.zeros_like(t)
-        whump_interval = int(self.sample_rate / whump_freq)
-        for i in range(0, len(t), whump_interval):
-            # Each whump: short burst, then decay
-            whump_len = int(self.sample_rate * 0.07)  # 70ms per whump
-            end = min(i + whump_len, len(t))
-            envelope = np.exp(-np.linspace(0, 3, end - i))
-            # Low thump: sine + noise
-            whump = 0.7 * np.sin(2 * np.pi * 60 * t[i:end])
-            whump += 0.3 * np.random.normal(0, 0.7, end - i)
-            whump *= envelope
-            pulse[i:end] += whump
-        # Normalize
-        pulse = pulse / (np.max(np.abs(pulse)) + 1e-6)
-        pulse = (pulse * 32767 * self.volume).astype(np.int16)
-        if pulse.ndim == 1:
-            pulse = np.column_stack((pulse, pulse))
-        sound = pygame.sndarray.make_sound(pulse)
+        sound = cached_sound(synth.whump_train, duration=self.duration, whumps_per_sec=whump_freq,
+                             freq=60, volume=self.volume, sample_rate=self.sample_rate)
         sound.set_volume(self.volume)
         return sound
 
@@ -166,93 +168,356 @@ class EngineSound:
             self.channel = None
             self.is_fast = False
 
+def render_tank_body(width, height):
+    image = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(image, (80, 80, 80), (0, 8, width, 16), border_radius=6)  # body
+    pygame.draw.rect(image, (60, 60, 60), (8, 0, width-16, 32), border_radius=8)  # hull
+    pygame.draw.circle(image, (120, 120, 120), (width//2, height//2), 12)  # turret base
+    return image
+
+class EnemyField:
+    """
+    Every tank's simulation state lives here as NumPy columns (struct of
+    arrays) so a whole tick is a handful of vectorized operations, and the
+    tank rules live in step() alone. EnemyTank objects are thin views onto
+    one slot each, for code that wants a single tank (one that was hit, one
+    that fires). Iterating the field yields the live tanks.
+
+    Level of detail: a moving tank further than lod_distance from the player
+    (off the radar, and well out of firing range) is only stepped every
+    lod_interval ticks, staggered across tanks, and then covers the ticks it
+    skipped in one straight move. lod_interval=1 steps every tank every tick.
+    """
+    COLUMNS = {
+        'world_x': np.float64,
+        'world_y': np.float64,
+        'prev_x': np.float64,  # Position before the last tick, for drawing between ticks
+        'prev_y': np.float64,
+        'turret_angle': np.float64,
+        'speed': np.float64,
+        'fire_cooldown': np.int32,
+        'bullet_cooldown_time': np.int32,
+        'pause_time': np.int32,
+        'paused': np.bool_,
+        'exploding': np.bool_,
+        'explode_timer': np.int32,
+        'lod_far': np.bool_,  # Beyond lod_distance when last stepped
+        'lod_phase': np.int32,  # Which of the lod_interval ticks a far tank moves on
+        'lod_owed': np.int32,  # Ticks skipped since it last moved
+    }
+
+    def __init__(self, capacity=64, rng=None, lod_distance=3600, lod_interval=4):
+        self.rng = rng or random
+        self.lod_distance = lod_distance
+        self.lod_interval = lod_interval
+        self.tick = 0
+        self.allocated = 0  # Tanks ever added, to spread lod_phase
+        self.simulated = 0  # Tanks stepped on the last tick (not paused, exploding or skipped)
+        self.count = 0
+        self.tanks = []
+        self.armed = set()  # Tanks that may have bullets in flight
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.tanks)
+
+    def __getitem__(self, index):
+        return self.tanks[index]
+
+    def spawn(self, player_world_x, player_world_y, **kwargs):
+        return EnemyTank(player_world_x, player_world_y, field=self, **kwargs)
+
+    def _allocate(self, tank):
+        # Called by EnemyTank.__init__; returns the tank's slot
+        if self.count == len(self.world_x):
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                grown = np.zeros(len(column) * 2, dtype=column.dtype)
+                grown[:self.count] = column[:self.count]
+                setattr(self, name, grown)
+        slot = self.count
+        for name in self.COLUMNS:
+            getattr(self, name)[slot] = 0
+        self.lod_phase[slot] = self.allocated % self.lod_interval
+        self.allocated += 1
+        self.tanks.append(tank)
+        self.count += 1
+        return slot
+
+    def remove(self, tank):
+        # Swap-remove: the last tank moves into the freed slot
+        slot = tank.slot
+        last = self.count - 1
+        if slot != last:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved = self.tanks[last]
+            moved.slot = slot
+            self.tanks[slot] = moved
+        self.tanks.pop()
+        self.count -= 1
+        self.armed.discard(tank)
+
+    def clear(self):
+        self.tanks = []
+        self.count = 0
+        self.armed.clear()
+
+    def positions(self):
+        # Views of the live tanks' world coordinates
+        return self.world_x[:self.count], self.world_y[:self.count]
+
+    def _finish_explosions(self, exploding):
+        # Tick explosion timers; drop tanks whose animation is over
+        n = self.count
+        self.explode_timer[:n][exploding] -= 1
+        done = np.flatnonzero(exploding & (self.explode_timer[:n] <= 0))
+        for slot in done[::-1]:  # Highest first so swap-remove keeps the rest valid
+            self.remove(self.tanks[slot])
+
+    def step(self, player_world_x, player_world_y, screen_width=1920, screen_height=1080):
+        """Advance every tank one tick. Returns the tanks that fired."""
+        fired = []
+        self.tick += 1
+        self.simulated = 0
+        n = self.count
+        if n == 0:
+            return fired
+        self.prev_x[:n] = self.world_x[:n]
+        self.prev_y[:n] = self.world_y[:n]
+        exploding = self.exploding[:n]
+        paused = self.paused[:n]
+        waiting = paused & ~exploding
+        active = ~(exploding | paused)
+        self.pause_time[:n][waiting] -= 1
+        paused[waiting & (self.pause_time[:n] <= 0)] = False
+        idx = np.flatnonzero(active)
+        if self.lod_interval > 1 and len(idx):
+            # Far tanks wait for their turn
+            due = ~self.lod_far[idx] | ((self.tick + self.lod_phase[idx]) % self.lod_interval == 0)
+            self.lod_owed[idx[~due]] += 1
+            idx = idx[due]
+        self.simulated = len(idx)
+        if len(idx):
+            x = self.world_x[idx]
+            y = self.world_y[idx]
+            # Ticks to cover: 1, or more for a far tank that skipped some
+            ticks = self.lod_owed[idx] + 1
+            self.lod_owed[idx] = 0
+            speed = self.speed[idx] * ticks
+            # Move toward the player's visible ground position (ignore height)
+            dx = player_world_x - x
+            dy = player_world_y - y
+            dist = np.hypot(dx, dy)
+            aim = np.arctan2(dy, dx)
+            edge_dist = max(screen_width, screen_height) * 0.48
+            preferred_dist = edge_dist * 0.92
+            # Far tanks close in; near ones circle the player on the ground
+            far = dist > preferred_dist
+            move_angle = np.where(far, aim, aim + math.pi / 2)
+            step = np.where(far, speed, speed * 0.7)
+            self.world_x[idx] = x + np.cos(move_angle) * step
+            self.world_y[idx] = y + np.sin(move_angle) * step
+            # Never coarse within firing range, even on a huge screen
+            self.lod_far[idx] = dist > max(self.lod_distance, edge_dist * 1.1)
+            # Aim turret at player
+            self.turret_angle[idx] = np.degrees(aim)
+            # Fire at player
+            cooldown = self.fire_cooldown[idx]
+            self.fire_cooldown[idx] = np.maximum(cooldown - ticks, 0)
+            for slot in idx[(cooldown == 0) & (dist < edge_dist * 1.05)]:
+                tank = self.tanks[slot]
+                if len(tank.bullets) < tank.max_bullets:
+                    tank.fire_bullet()
+                    fired.append(tank)
+                    self.armed.add(tank)
+                    self.bullet_cooldown_time[slot] = self.rng.randint(90, 180)
+                    self.fire_cooldown[slot] = self.bullet_cooldown_time[slot]
+        # Bullets only fly while their tank is active
+        for tank in list(self.armed):
+            if not tank.bullets:
+                self.armed.discard(tank)
+            elif active[tank.slot]:
+                for bullet in tank.bullets[:]:
+                    bullet.update()
+                    if bullet.lifetime <= 0:
+                        tank.bullets.remove(bullet)
+        self._finish_explosions(exploding)
+        return fired
+
+    def first_hits(self, rects):
+        """
+        For each world rect in rects, the live (not exploding) tank whose body
+        it overlaps, or None; the lowest slot wins if several do. Same test as
+        Rect.colliderect against each tank's get_world_rect(), done on the
+        columns, so only the tanks hit are ever looked at.
+        """
+        hits = [None] * len(rects)
+        n = self.count
+        if n == 0 or not rects:
+            return hits
+        width, height = EnemyTank.width, EnemyTank.height
+        # Tank rects as pygame.Rect builds them from floats (truncated)
+        left = (self.world_x[:n] - width // 2).astype(np.int64)
+        top = (self.world_y[:n] - height // 2).astype(np.int64)
+        x, y, w, h = np.array(rects, dtype=np.int64).reshape(-1, 4).T
+        right, bottom = x + w, y + h
+        # Only tanks overlapping the box around all the rects can be hit
+        near = np.flatnonzero(~self.exploding[:n] & (left < right.max()) & (left + width > x.min()) &
+                              (top < bottom.max()) & (top + height > y.min()))
+        if len(near) == 0:
+            return hits
+        left, top = left[near], top[near]
+        overlap = ((left < right[:, None]) & (left + width > x[:, None]) &
+                   (top < bottom[:, None]) & (top + height > y[:, None]))
+        for i in np.flatnonzero(overlap.any(axis=1)).tolist():
+            hits[i] = self.tanks[near[overlap[i].argmax()]]
+        return hits
+
+    def advance_explosions(self):
+        # Extra explosion tick main.run gives exploding tanks after collisions
+        self._finish_explosions(self.exploding[:self.count].copy())
+
+    def snapshot(self):
+        return TankSnapshot(self)
+
+class TankSnapshot:
+    """
+    Frozen copy of an EnemyField: every tank's position (for the radar) plus
+    what drawing the field needs. draw() matches drawing each tank in turn,
+    leaving out tanks and bullets out of view.
+    """
+    def __init__(self, field):
+        n = field.count
+        self.x = field.world_x[:n].copy()
+        self.y = field.world_y[:n].copy()
+        shown = np.flatnonzero(~field.exploding[:n])  # Exploding tanks are particles
+        self.prev_x = field.prev_x[shown]
+        self.prev_y = field.prev_y[shown]
+        self.shown_x = self.x[shown]
+        self.shown_y = self.y[shown]
+        self.turret_angle = field.turret_angle[shown]
+        self.look = field.tanks[shown[0]] if len(shown) else None  # Tanks all look the same
+        # Each shown tank's bullets are bullets[bullet_start[i]:bullet_start[i + 1]].
+        # Only armed tanks can have any, so the rest are never visited
+        armed = sorted((tank.slot, tank.bullets) for tank in field.armed if tank.bullets and not field.exploding[tank.slot])
+        counts = np.zeros(len(shown), dtype=np.int64)
+        counts[np.searchsorted(shown, np.array([slot for slot, _ in armed], dtype=np.int64))] = [len(bullets) for _, bullets in armed]
+        self.bullet_start = np.concatenate(([0], np.cumsum(counts)))
+        self.bullets = SpriteSnapshot([bullet for _, bullets in armed for bullet in bullets])
+        self.simulated = field.simulated
+
+    def __len__(self):
+        return len(self.x)
+
+    def positions(self):
+        return self.x, self.y
+
+    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT, alpha=1.0):
+        # Returns how many tanks and how many bullets were drawn
+        if self.look is None:
+            return 0, 0
+        x = self.shown_x + (self.prev_x - self.shown_x) * (1 - alpha)
+        y = self.shown_y + (self.prev_y - self.shown_y) * (1 - alpha)
+        screen_xs = (x - camera_x + WIDTH // 2).astype(np.int64)
+        screen_ys = (y - camera_y + HEIGHT // 2).astype(np.int64)
+        # Furthest a tank's body or turret reaches from its centre
+        look = self.look
+        reach = max(look.width // 2, look.height // 2, look.turret_length + look.turret_width)
+        tank_in_view = (screen_xs + reach > 0) & (screen_xs - reach < WIDTH) & (screen_ys + reach > 0) & (screen_ys - reach < HEIGHT)
+        # Tanks with a bullet in view, from the running count of those
+        left, top, bullet_in_view = self.bullets.layout(camera_x, camera_y, WIDTH, HEIGHT, alpha)
+        bullets_in_view = np.concatenate(([0], np.cumsum(bullet_in_view)))[self.bullet_start]
+        has_bullets = bullets_in_view[1:] > bullets_in_view[:-1]
+        drawn = np.flatnonzero(tank_in_view | has_bullets).tolist()
+        if not drawn:
+            return 0, 0
+        start = self.bullet_start.tolist()
+        tank_in_view, has_bullets = tank_in_view.tolist(), has_bullets.tolist()
+        screen_xs, screen_ys, turret_angles = screen_xs.tolist(), screen_ys.tolist(), self.turret_angle.tolist()
+        images, left, top, bullet_in_view = self.bullets.images, left.tolist(), top.tolist(), bullet_in_view.tolist()
+        for i in drawn:
+            if tank_in_view[i]:
+                _draw_tank(screen, look, screen_xs[i], screen_ys[i], turret_angles[i])
+            if has_bullets[i]:
+                screen.blits([(images[j], (left[j], top[j])) for j in range(start[i], start[i + 1]) if bullet_in_view[j]], doreturn=False)
+        return sum(tank_in_view), int(bullets_in_view[-1])
+
+class _FieldColumn:
+    # EnemyTank attribute stored in its field's NumPy column of the same name
+    def __init__(self, cast):
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, tank, owner=None):
+        if tank is None:
+            return self
+        return self.cast(getattr(tank.field, self.name)[tank.slot])
+
+    def __set__(self, tank, value):
+        getattr(tank.field, self.name)[tank.slot] = value
+
 class EnemyTank(pygame.sprite.Sprite):
-    def __init__(self, player_world_x, player_world_y, spawn_outside_radar=False, radar_radius=3600, pause_time=0, avoid_positions=None):
+    width = 60
+    height = 32
+    turret_length = 38
+    turret_width = 8
+    world_x = _FieldColumn(float)
+    world_y = _FieldColumn(float)
+    prev_x = _FieldColumn(float)
+    prev_y = _FieldColumn(float)
+    turret_angle = _FieldColumn(float)
+    speed = _FieldColumn(float)
+    fire_cooldown = _FieldColumn(int)
+    bullet_cooldown_time = _FieldColumn(int)
+    pause_time = _FieldColumn(int)
+    paused = _FieldColumn(bool)
+    exploding = _FieldColumn(bool)
+    explode_timer = _FieldColumn(int)
+
+    def __init__(self, player_world_x, player_world_y, spawn_outside_radar=False, radar_radius=3600, pause_time=0, position=None, field=None):
         super().__init__()
-        self.width = 60
-        self.height = 32
-        self.turret_length = 38
-        self.turret_width = 8
-        self.body_image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(self.body_image, (80, 80, 80), (0, 8, self.width, 16), border_radius=6)  # body
-        pygame.draw.rect(self.body_image, (60, 60, 60), (8, 0, self.width-16, 32), border_radius=8)  # hull
-        pygame.draw.circle(self.body_image, (120, 120, 120), (self.width//2, self.height//2), 12)  # turret base
-        self.image = self.body_image.copy()
+        # A tank made on its own gets a private field
+        self.field = field if field is not None else EnemyField(capacity=1)
+        self.slot = self.field._allocate(self)
+        rng = self.field.rng
+        self.body_image = cached_image(render_tank_body, width=self.width, height=self.height)
+        self.image = self.body_image
         self.rect = self.body_image.get_rect()
-        # Spawn at a random position
-        if spawn_outside_radar:
-            angle = random.uniform(0, 2 * math.pi)
-            dist = radar_radius + 200 + random.uniform(0, 200)
-            if avoid_positions:
-                for _ in range(20):
-                    angle = random.uniform(0, 2 * math.pi)
-                    candidate_x = player_world_x + math.cos(angle) * dist
-                    candidate_y = player_world_y + math.sin(angle) * dist
-                    if all(math.hypot(candidate_x - x, candidate_y - y) > self.width * 5 for (x, y) in avoid_positions):
-                        break
-                self.world_x = candidate_x
-                self.world_y = candidate_y
-            else:
-                self.world_x = player_world_x + math.cos(angle) * dist
-                self.world_y = player_world_y + math.sin(angle) * dist
+        # Spawn at position (see spawn.SpawnDirector) or at a random one
+        if position is not None:
+            self.world_x, self.world_y = position
+        elif spawn_outside_radar:
+            angle = rng.uniform(0, 2 * math.pi)
+            dist = radar_radius + 200 + rng.uniform(0, 200)
+            self.world_x = player_world_x + math.cos(angle) * dist
+            self.world_y = player_world_y + math.sin(angle) * dist
         else:
-            angle = random.uniform(0, 2 * math.pi)
-            dist = random.uniform(900, 1400)
+            angle = rng.uniform(0, 2 * math.pi)
+            dist = rng.uniform(900, 1400)
             self.world_x = player_world_x + math.cos(angle) * dist
             self.world_y = player_world_y + math.sin(angle) * dist
+        self.prev_x = self.world_x
+        self.prev_y = self.world_y
         self.turret_angle = 0
         self.speed = 3.2
         self.fire_cooldown = 0
         self.bullets = []
         self.max_bullets = 1
         self.bullet_speed = 14
-        self.bullet_cooldown_time = random.randint(90, 180)
+        self.bullet_cooldown_time = rng.randint(90, 180)
         self.pause_time = pause_time
         self.paused = pause_time > 0
         self.exploding = False
         self.explode_timer = 0
 
-    def update(self, player_world_x, player_world_y, screen_width=1920, screen_height=1080):
-        if self.exploding:
-            self.explode_timer -= 1
-            if self.explode_timer <= 0:
-                return 'remove'  # Signal to remove this tank
-            return None
-        if self.paused:
-            self.pause_time -= 1
-            if self.pause_time <= 0:
-                self.paused = False
-            return None
-        # Move toward the player's visible ground position (ignore height)
-        dx = player_world_x - self.world_x
-        dy = player_world_y - self.world_y
-        dist = math.hypot(dx, dy)
-        edge_dist = max(screen_width, screen_height) * 0.48
-        preferred_dist = edge_dist * 0.92
-        if dist > preferred_dist:
-            move_angle = math.atan2(dy, dx)
-            self.world_x += math.cos(move_angle) * self.speed
-            self.world_y += math.sin(move_angle) * self.speed
-        else:
-            # Circle the player on the ground
-            tangent_angle = math.atan2(dy, dx) + math.pi / 2
-            self.world_x += math.cos(tangent_angle) * self.speed * 0.7
-            self.world_y += math.sin(tangent_angle) * self.speed * 0.7
-        # Aim turret at player
-        self.turret_angle = math.degrees(math.atan2(dy, dx))
-        # Fire at player
-        if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1
-        elif dist < edge_dist * 1.05 and len(self.bullets) < self.max_bullets:
-            self.fire_bullet()
-            self.bullet_cooldown_time = random.randint(90, 180)
-            self.fire_cooldown = self.bullet_cooldown_time
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.lifetime <= 0:
-                self.bullets.remove(bullet)
-        return None
-
     def fire_bullet(self):
         rad = math.radians(self.turret_angle)
         bx = self.world_x + math.cos(rad) * (self.width // 2 + self.turret_length // 2)
@@ -261,86 +526,106 @@ class EnemyTank(pygame.sprite.Sprite):
 
     def start_explode(self):
         self.exploding = True
-        self.explode_timer = 36  # ~0.6s at 60 FPS
-
-    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT):
-        screen_x = int(self.world_x - camera_x + WIDTH // 2)
-        screen_y = int(self.world_y - camera_y + HEIGHT // 2)
-        if self.exploding:
-            # Draw explosion (simple expanding yellow/orange circle)
-            t = 36 - self.explode_timer
-            radius = 24 + t * 2
-            color = (255, 200 - t*4, 60)
-            pygame.draw.circle(screen, color, (screen_x, screen_y), radius)
-            if t > 12:
-                pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), radius // 2)
-            return
-        # Draw tank body
-        screen.blit(self.body_image, (screen_x - self.width // 2, screen_y - self.height // 2))
-        # Draw turret
-        turret_rad = math.radians(self.turret_angle)
-        turret_base = (screen_x, screen_y)
-        turret_tip = (int(screen_x + math.cos(turret_rad) * self.turret_length), int(screen_y + math.sin(turret_rad) * self.turret_length))
-        pygame.draw.line(screen, (100, 200, 100), turret_base, turret_tip, self.turret_width)
-        pygame.draw.circle(screen, (120, 120, 120), turret_base, 12)
-        # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(screen, camera_x, camera_y, WIDTH, HEIGHT)
+        self.explode_timer = 36  # ~0.6s of 60 Hz ticks
 
     def get_world_rect(self):
         return pygame.Rect(self.world_x - self.width // 2, self.world_y - self.height // 2, self.width, self.height)
 
+def _draw_tank(screen, look, screen_x, screen_y, turret_angle):
+    # Body and turret centred on screen_x, screen_y; look is any EnemyTank
+    # (for its body image and sizes)
+    screen.blit(look.body_image, (screen_x - look.width // 2, screen_y - look.height // 2))
+    turret_rad = math.radians(turret_angle)
+    turret_base = (screen_x, screen_y)
+    turret_tip = (int(screen_x + math.cos(turret_rad) * look.turret_length), int(screen_y + math.sin(turret_rad) * look.turret_length))
+    pygame.draw.line(screen, (100, 200, 100), turret_base, turret_tip, look.turret_width)
+    pygame.draw.circle(screen, (120, 120, 120), turret_base, 12)
+
+def render_explosion(t):
+    # Simple expanding yellow/orange circle, t ticks into the explosion
+    radius = 24 + t * 2
+    image = render_circle(radius, (255, 200 - t*4, 60))
+    if t > 12:
+        pygame.draw.circle(image, (255, 255, 255), image.get_rect().center, radius // 2)
+    return image
+
+def explosion_frames():
+    # A dying tank's timer runs down two ticks per frame (step() and
+    # advance_explosions()), so only the odd stages are ever on screen
+    return [render_explosion(t) for t in range(1, 36, 2)]
+
+def render_tank_bullet(length, width):
+    image = pygame.Surface((length, width), pygame.SRCALPHA)
+    pygame.draw.rect(image, (200, 255, 80), (0, 0, length, width), border_radius=2)
+    return image
+
 class TankBullet:
+    """
+    A tank shot. Turret angles are continuous, so headings are quantized to
+    ANGLE_STEP degree buckets and every bullet in a bucket shares one
+    pre-rotated image; the cache never holds more than 360 / ANGLE_STEP images.
+    """
+    __slots__ = ('world_x', 'world_y', 'prev_x', 'prev_y', 'vx', 'vy', 'angle', 'speed', 'lifetime', 'image', 'world_rect')
+    length = 18
+    width = 6
+    ANGLE_STEP = 2
+    _images = {}  # angle bucket -> rotated bullet
+
     def __init__(self, x, y, angle, speed=14):
-        self.length = 18
-        self.width = 6
-        base_image = pygame.Surface((self.length, self.width), pygame.SRCALPHA)
-        pygame.draw.rect(base_image, (200, 255, 80), (0, 0, self.length, self.width), border_radius=2)
-        # Fix orientation: rotate by angle-90 so the bullet points in the firing direction
-        self.image = pygame.transform.rotate(base_image, angle - 90)
-        self.rect = self.image.get_rect(center=(x, y))
+        self.image = self.image_for(angle)
+        self.world_rect = pygame.Rect(0, 0, self.length, self.width)
         self.angle = angle
         self.speed = speed
         rad = math.radians(self.angle)
         self.vx = math.cos(rad) * self.speed
         self.vy = math.sin(rad) * self.speed
-        self.world_x = x
-        self.world_y = y
+        self.world_x = self.prev_x = x
+        self.world_y = self.prev_y = y
         self.lifetime = 120
 
+    @classmethod
+    def image_for(cls, angle):
+        bucket = round(angle / cls.ANGLE_STEP) % (360 // cls.ANGLE_STEP)
+        image = cls._images.get(bucket)
+        if image is None:
+            base_image = cached_image(render_tank_bullet, length=cls.length, width=cls.width)
+            # Fix orientation: rotate by angle-90 so the bullet points in the firing direction
+            image = for_display(pygame.transform.rotate(base_image, bucket * cls.ANGLE_STEP - 90))
+            cls._images[bucket] = image
+        return image
+
     def update(self):
+        self.prev_x = self.world_x
+        self.prev_y = self.world_y
         self.world_x += self.vx
         self.world_y += self.vy
         self.lifetime -= 1
 
-    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT):
-        screen_x = int(self.world_x - camera_x + WIDTH // 2)
-        screen_y = int(self.world_y - camera_y + HEIGHT // 2)
-        self.rect = self.image.get_rect(center=(screen_x, screen_y))
-        screen.blit(self.image, self.rect)
-
     def get_world_rect(self):
-        return pygame.Rect(self.world_x - self.length // 2, self.world_y - self.width // 2, self.length, self.width)
+        # Updated in place; copy it if you need to keep it
+        self.world_rect.topleft = (self.world_x - self.length // 2, self.world_y - self.width // 2)
+        return self.world_rect
+
+def damage_samples(duration=0.22, freq=110, sample_rate=44100, volume=0.55, rng=None):
+    t = synth.time_axis(duration, sample_rate)
+    # A metallic clang + static burst, the burst fading out over the duration
+    wave = 0.5 * synth.noise(0.7, t.shape, rng)
+    wave += 0.2 * np.sin(2 * np.pi * (freq * 2.7) * t)
+    wave *= 1 - t / duration
+    wave += 0.6 * np.sin(2 * np.pi * freq * t)
+    wave *= np.exp(-7 * t)
+    return synth.to_stereo_int16(wave, volume)
 
 def generate_damage_sound(duration=0.22, freq=110, sample_rate=44100, volume=0.55):
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    envelope = np.exp(-7 * t)
-    # A metallic clang + static burst
-    wave = 0.6 * np.sin(2 * np.pi * freq * t) * envelope
-    wave += 0.5 * np.random.normal(0, 0.7, t.shape) * envelope * (1 - t / duration)
-    wave += 0.2 * np.sin(2 * np.pi * (freq * 2.7) * t) * envelope * (1 - t / duration)
-    wave = (wave * 32767 * volume).astype(np.int16)
-    if wave.ndim == 1:
-        wave = np.column_stack((wave, wave))
-    return pygame.sndarray.make_sound(wave)
+    return cached_sound(damage_samples, duration=duration, freq=freq, sample_rate=sample_rate, volume=volume)
 
-def generate_tank_fire_sound(duration=0.22, freq=60, sample_rate=44100, volume=0.7):
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    envelope = np.exp(-5 * t)
+def tank_fire_samples(duration=0.22, freq=60, sample_rate=44100, volume=0.7, rng=None):
+    t = synth.time_axis(duration, sample_rate)
     # Low boom: sine + noise
-    wave = 0.7 * np.sin(2 * np.pi * freq * t) * envelope
-    wave += 0.3 * np.random.normal(0, 0.5, t.shape) * envelope
-    wave = (wave * 32767 * volume).astype(np.int16)
-    if wave.ndim == 1:
-        wave = np.column_stack((wave, wave))
-    return pygame.sndarray.make_sound(wave)
+    wave = 0.7 * np.sin(2 * np.pi * freq * t)
+    wave += 0.3 * synth.noise(0.5, t.shape, rng)
+    wave *= np.exp(-5 * t)
+    return synth.to_stereo_int16(wave, volume)
+
+def generate_tank_fire_sound(duration=0.22, freq=60, sample_rate=44100, volume=0.7):
+    return cached_sound(tank_fire_samples, duration=duration, freq=freq, sample_rate=sample_rate, volume=volume)
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Run the game simulation without a window, sound or frame cap: a seeded round
+driven by a scripted input stream, as fast as the machine allows. Useful for
+benchmarking simulation throughput and for checking that a change leaves a
+recorded round unchanged.
+
+    python -m game.headless --ticks 10000 --seed 1
+    python -m game.headless --ticks 3600 --script inputs.jsonl --metrics ticks.csv
+    python -m game.headless --replay round.rec --metrics ticks.csv
+
+A script file has one JSON list [move, turn, fire] per line, one per tick;
+ticks past its end get no input. --replay plays a round recorded with
+run_game.py --record, with its seed, view size and tick rate, to its end.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import csv
+import itertools
+import json
+import time
+from collections import namedtuple
+from .simulation import Simulation, TickInput, IDLE
+from .replay import load_recording
+
+TickMetrics = namedtuple('TickMetrics', 'tick ms tanks tanks_simulated bullets tank_bullets particles score hearts')
+
+def autopilot():
+    # Endless stand-in for a player: fly loops and keep firing
+    for tick in itertools.count():
+        yield TickInput(move=1 if tick % 200 < 120 else 0,
+                        turn=1 if tick % 90 < 30 else 0,
+                        fire=1 if tick % 7 == 0 else 0)
+
+def load_script(path):
+    with open(path) as f:
+        return [TickInput(*json.loads(line)) for line in f if line.strip()]
+
+def run_headless(ticks, seed=0, script=None, width=1280, height=720, max_tanks=48, spawn_interval=4):
+    """
+    Play up to ticks ticks of a round seeded with seed, reading one TickInput
+    per tick from script (default: autopilot()). Stops early on game over.
+    Returns (final state dict, list of TickMetrics).
+    """
+    import pygame
+    pygame.display.init()
+    try:
+        sim = Simulation(width, height, seed=seed, max_tanks=max_tanks, spawn_interval=spawn_interval)
+        inputs = itertools.chain(script if script is not None else autopilot(), itertools.repeat(IDLE))
+        metrics = []
+        clock = time.perf_counter
+        for tick_input in itertools.islice(inputs, ticks):
+            start = clock()
+            sim.step(tick_input)
+            elapsed = (clock() - start) * 1000
+            metrics.append(TickMetrics(sim.tick, elapsed, len(sim.enemies), sim.enemies.simulated, len(sim.bullets),
+                                       sum(len(tank.bullets) for tank in sim.enemies.armed),
+                                       len(sim.sparks) + len(sim.explosions), sim.score, sim.hearts))
+            if sim.game_over:
+                break
+        state = sim.state()
+        sim.release()
+        return state, metrics
+    finally:
+        pygame.display.quit()
+
+def write_metrics(metrics, path):
+    with open(path, 'w', newline='') as f:
+        if path.endswith('.jsonl'):
+            for row in metrics:
+                f.write(json.dumps(row._asdict()) + "\n")
+        else:
+            writer = csv.writer(f)
+            writer.writerow(TickMetrics._fields)
+            writer.writerows(metrics)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game simulation headless.")
+    parser.add_argument('--ticks', type=int, help="ticks to run (default 3600, or the whole replay)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--script', help="JSON lines of [move, turn, fire], one per tick")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--max-tanks', type=int, default=48, help="most tanks alive at once")
+    parser.add_argument('--spawn-interval', type=int, default=4, help="fewest ticks between two spawns")
+    parser.add_argument('--replay', help="a recording from run_game.py --record; sets seed, size and spawn limits")
+    parser.add_argument('--metrics', help="write per-tick metrics to this .csv or .jsonl file")
+    args = parser.parse_args(argv)
+    script = load_script(args.script) if args.script else None
+    seed, width, height = args.seed, args.width, args.height
+    max_tanks, spawn_interval = args.max_tanks, args.spawn_interval
+    ticks = args.ticks if args.ticks is not None else 3600
+    if args.replay:
+        recording = load_recording(args.replay)
+        script = recording.inputs
+        seed, width, height = recording.seed, recording.width, recording.height
+        max_tanks, spawn_interval = recording.max_tanks, recording.spawn_interval
+        if args.ticks is None:
+            ticks = len(script)
+    start = time.perf_counter()
+    state, metrics = run_headless(ticks, seed, script, width, height, max_tanks, spawn_interval)
+    wall = time.perf_counter() - start
+    if args.metrics:
+        write_metrics(metrics, args.metrics)
+    tick_ms = sorted(row.ms for row in metrics)
+    if tick_ms:
+        print(f"{len(metrics)} ticks in {wall:.2f}s ({len(metrics) / wall:.0f} ticks/s), "
+              f"tick ms p50 {tick_ms[len(tick_ms) // 2]:.3f} p99 {tick_ms[int(len(tick_ms) * 0.99)]:.3f} max {tick_ms[-1]:.3f}")
+    print(json.dumps(state))
+
+if __name__ == "__main__":
+    main()
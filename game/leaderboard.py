@@ -1,44 +1,215 @@
 import json
-from pathlib import Path
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from .settings import CONFIG_DIR
 
-CONFIG_DIR = Path(__file__).parent.parent / "config"
-CONFIG_DIR.mkdir(exist_ok=True)
-LEADERBOARD_FILE = CONFIG_DIR / "leaderboard.json"
+LEADERBOARD_FILE = CONFIG_DIR / "leaderboard.json"  # Old storage, imported into the database once
+LEADERBOARD_DB = CONFIG_DIR / "leaderboard.db"
 
-# Always keep only top N scores
-def load_leaderboard(max_entries=10):
-    if LEADERBOARD_FILE.exists():
+# Top N scores from the old JSON file (None: all of them); entries that
+# can't be read are skipped rather than failing the whole file
+def load_leaderboard(max_entries=10, path=LEADERBOARD_FILE):
+    try:
+        with open(path, 'r') as f:
+            scores = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(scores, list):
+        return []
+    valid = []
+    for entry in scores:
+        try:
+            valid.append({"name": str(entry["name"]), "score": int(entry["score"])})
+        except (KeyError, TypeError, ValueError):
+            pass
+    return sorted(valid, key=lambda x: x["score"], reverse=True)[:max_entries]
+
+class ScoreStore:
+    """
+    Every score ever submitted, in an SQLite database. Each insert is its own
+    transaction, so a crash can lose the score being written but never the
+    ones before it. WAL mode lets game instances sharing the config folder
+    read while another one writes; writers wait up to timeout seconds for
+    each other. Scores in the old leaderboard.json are imported when the
+    database is created.
+
+    A file that isn't a readable database is moved aside (to
+    leaderboard.db.corrupt) and the database built again from
+    leaderboard.json. Other errors, such as a locked or unopenable file,
+    raise sqlite3.DatabaseError.
+    """
+    VERSION = 1  # Schema version, kept in PRAGMA user_version
+
+    def __init__(self, path=LEADERBOARD_DB, legacy_file=LEADERBOARD_FILE, timeout=5.0):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = None
+        try:
+            self._open(legacy_file, timeout)
+        except sqlite3.OperationalError:
+            raise  # Locked, read-only, ...: the file may well be fine
+        except sqlite3.DatabaseError as error:
+            if self.conn is not None:
+                self.conn.close()
+            corrupt = path.with_name(path.name + ".corrupt")
+            print(f"Warning: {path} is unreadable ({error}); moved to {corrupt.name} and starting over", file=sys.stderr)
+            path.replace(corrupt)
+            for suffix in ("-wal", "-shm"):
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+            self._open(legacy_file, timeout)
+
+    def _open(self, legacy_file, timeout):
+        # Autocommit; writes open their own transactions, see _write()
+        self.conn = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate(legacy_file)
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def _write(self):
+        # IMMEDIATE takes the write lock up front, so concurrent writers queue
+        # instead of failing halfway through
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _migrate(self, legacy_file):
+        with self._write() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= self.VERSION:
+                return
+            conn.execute("CREATE TABLE IF NOT EXISTS scores ("
+                         "id INTEGER PRIMARY KEY, name TEXT NOT NULL, score INTEGER NOT NULL, created REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score DESC)")
+            now = time.time()
+            conn.executemany("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)",
+                             [(entry["name"], entry["score"], now) for entry in load_leaderboard(None, legacy_file)])
+            conn.execute(f"PRAGMA user_version = {self.VERSION}")
+
+    def add(self, name, score):
+        with self._write() as conn:
+            conn.execute("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)", (name, score, time.time()))
+
+    def top(self, n=10):
+        # Best n scores, earlier first on ties, as {"name", "score"} dicts
+        rows = self.conn.execute("SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ?", (n,))
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def best_per_player(self, n=10):
+        # Each name's best score, top n names
+        rows = self.conn.execute("SELECT name, MAX(score) AS best FROM scores GROUP BY name ORDER BY best DESC, MIN(id) LIMIT ?", (n,))
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def history(self, name=None):
+        # Every score (of one name, if given), oldest first, with its unix time
+        query = "SELECT name, score, created FROM scores"
+        rows = self.conn.execute(query + " WHERE name = ? ORDER BY id", (name,)) if name is not None else self.conn.execute(query + " ORDER BY id")
+        return [{"name": name, "score": score, "created": created} for name, score, created in rows]
+
+    def data_version(self):
+        # Changes whenever another connection commits to the database
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+class Leaderboard:
+    """
+    The top scores, kept in memory on top of a ScoreStore (opened on first
+    use). The top list is only queried again when another game instance
+    has written to the store (looked at no more than every recheck
+    seconds); add() updates store and memory together. Entry lines are
+    rendered once per change, so drawing the board is just blits.
+
+    If the store can't be used, a warning is printed and the board goes on
+    in memory only: empty to start with, plus the scores added since.
+    """
+    def __init__(self, max_entries=10, recheck=1.0, path=LEADERBOARD_DB):
+        self.max_entries = max_entries
+        self.recheck = recheck
+        self.path = path
+        self._store = None
+        self._broken = False  # The store failed; don't try it again
+        self._scores = None
+        self._version = None
+        self._checked = 0.0
+        self._images = None  # (font, color, rendered lines)
+
+    @property
+    def store(self):
+        # The ScoreStore, or None if it can't be used
+        if self._store is None and not self._broken:
+            try:
+                self._store = ScoreStore(self.path)
+            except (sqlite3.DatabaseError, OSError) as error:
+                self._fail(error)
+        return self._store
+
+    def _fail(self, error):
+        print(f"Warning: leaderboard unavailable, scores are not saved ({error})", file=sys.stderr)
+        self._broken = True
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        if self._scores is None:
+            self._scores = []
+            self._images = None
+
+    def scores(self):
+        now = time.monotonic()
+        if self._scores is None or now - self._checked >= self.recheck:
+            self._checked = now
+            store = self.store
+            if store is not None:
+                try:
+                    version = store.data_version()
+                    if self._scores is None or version != self._version:
+                        self._version = version
+                        self._scores = store.top(self.max_entries)
+                        self._images = None
+                except sqlite3.DatabaseError as error:
+                    self._fail(error)
+        return self._scores
+
+    def add(self, name, score):
+        # Clean name input
+        if not name or not isinstance(name, str) or not name.strip():
+            name = "Anonymous"
+        name = name.strip()[:16]
         try:
-            with open(LEADERBOARD_FILE, 'r') as f:
-                scores = json.load(f)
-                # Validate structure
-                if not isinstance(scores, list):
-                    return []
-                for entry in scores:
-                    if not isinstance(entry, dict) or 'name' not in entry or 'score' not in entry:
-                        return []
-                # Sort and trim
-                scores = sorted(scores, key=lambda x: x.get("score", 0), reverse=True)[:max_entries]
-                return scores
+            score = int(score)
         except Exception:
-            return []
-    return []
-
-def save_leaderboard(scores, max_entries=10):
-    # Always keep only top N
-    scores = sorted(scores, key=lambda x: x.get("score", 0), reverse=True)[:max_entries]
-    with open(LEADERBOARD_FILE, 'w') as f:
-        json.dump(scores, f, indent=2)
-
-def add_score(name, score, max_entries=10):
-    # Clean name input
-    if not name or not isinstance(name, str) or not name.strip():
-        name = "Anonymous"
-    name = name.strip()[:16]
-    try:
-        score = int(score)
-    except Exception:
-        score = 0
-    scores = load_leaderboard(max_entries)
-    scores.append({"name": name, "score": score})
-    save_leaderboard(scores, max_entries)
+            score = 0
+        self._images = None
+        store = self.store
+        if store is not None:
+            try:
+                store.add(name, score)
+                # Query rather than merge, to pick up other instances' scores too
+                self._scores = store.top(self.max_entries)
+                self._version = store.data_version()
+                return
+            except sqlite3.DatabaseError as error:
+                self._fail(error)
+        # No store: keep the score for this session
+        scores = (self._scores or []) + [{"name": name, "score": score}]
+        self._scores = sorted(scores, key=lambda x: x["score"], reverse=True)[:self.max_entries]
+
+    def entry_images(self, font, color=(255, 255, 255)):
+        # "1. name - score" lines, rendered again only when scores or font change
+        scores = self.scores()
+        if self._images is None or self._images[0] is not font or self._images[1] != color:
+            lines = [font.render(f"{i+1}. {entry['name']} - {entry['score']}", True, color) for i, entry in enumerate(scores)]
+            self._images = (font, color, lines)
+        return self._images[2]
+
+# The game's one leaderboard
+leaderboard = Leaderboard()
+
+def add_score(name, score):
+    leaderboard.add(name, score)
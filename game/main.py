@@ -1,45 +1,126 @@
+import importlib
+import sys
+import threading
+import time
 import pygame
-import random
-import math
-from .settings import WIDTH, HEIGHT, FPS
-from .player import Player
-from .enemy import EnemyTank, generate_rotor_sound, generate_bullet_fire_sound, generate_explosion_sound, generate_crash_sound, generate_damage_sound, generate_tank_fire_sound
-from .leaderboard import add_score, load_leaderboard
+from .settings import CONFIG_DIR, DEFAULT_SETTINGS, get_settings, save_settings
+from .leaderboard import add_score, leaderboard
 from .menu import draw_main_menu
-from .ui import show_settings_screen
+from .ui import show_settings_screen, wait_events, REPAINT_EVENTS
 from .gameover import show_score_entry_screen
-from .world import draw_ground_and_trees, draw_radar
-from .pausemenu import draw_pause_menu
+from .text import Hud, render_text
+from .startup import startup
+# The simulation, world, sounds and profiler are imported when the first
+# round starts (or by _warm_up() while the menu is up), not before the menu
 
-def run():
+# Longest stretch of real time one frame may catch up on (in seconds);
+# past it the game slows down rather than spiralling into ever more ticks
+MAX_CATCH_UP = 0.25
+
+def run(record=None, replay=None):
+    # record: write each round's inputs to this file (the latest round wins);
+    # replay: play the round recorded in this file instead of the menu
+    try:
+        _run(record, replay)
+    finally:
+        # A round quits the game by returning, so its worker is stopped first;
+        # quitting twice is harmless
+        pygame.quit()
+        # Frame timings recorded with F3 are kept in the config folder
+        # (there are none if no round was played)
+        profiler_module = sys.modules.get(f"{__package__}.profiler")
+        name = get_settings().get("PROFILE_DUMP", DEFAULT_SETTINGS["PROFILE_DUMP"])
+        if profiler_module and name and profiler_module.profiler.dump(CONFIG_DIR / name):
+            print(f"Frame profile written to {CONFIG_DIR / name}")
+
+def _warm_up():
+    # Import the round's modules and bake its one-shot sounds in the background
+    start = time.perf_counter()
+    for module in ('simulation', 'world', 'pausemenu', 'profiler'):
+        importlib.import_module(f".{module}", __package__)
+    from .enemy import generate_bullet_fire_sound, generate_explosion_sound, generate_crash_sound, generate_damage_sound, generate_tank_fire_sound
+    try:
+        for generate in (generate_bullet_fire_sound, generate_explosion_sound, generate_crash_sound, generate_damage_sound, generate_tank_fire_sound):
+            generate()
+    except pygame.error:
+        pass  # No mixer; the round will report it
+    if startup.enabled:
+        print(f"Background warm-up (round modules, sounds): {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+def _new_round(width, height, sim_thread, max_tanks, spawn_interval, record=None, recording=None):
+    # A fresh round: (simulation, its worker or None, playback or None).
+    # Replays recording if given (with its size and spawn limits), otherwise
+    # records to record if given
+    from .simulation import Simulation
+    from .worker import SimulationWorker
+    from .replay import InputRecorder, Playback
+    playback = None
+    if recording is not None:
+        sim = Simulation(recording.width, recording.height, seed=recording.seed,
+                         max_tanks=recording.max_tanks, spawn_interval=recording.spawn_interval)
+        playback = Playback(recording)
+    else:
+        sim = Simulation(width, height, max_tanks=max_tanks, spawn_interval=spawn_interval)
+        if record:
+            sim.recorder = InputRecorder(record, sim.seed, width, height, max_tanks, spawn_interval)
+    worker = SimulationWorker(sim, inputs=playback) if sim_thread else None
+    return sim, worker, playback
+
+def _run(record=None, replay=None):
+    recording = None
+    if replay:
+        from .replay import load_recording
+        recording = load_recording(replay)
     pygame.init()
+    startup.mark('pygame.init')
     font = pygame.font.SysFont(None, 36)
+    warming_up = None  # Background thread started after the first menu frame
 
     while True:
         # --- SETTINGS & SCREEN INIT ---
-        from .settings import load_settings, save_settings
-        settings = load_settings()
+        settings = get_settings()
+        startup.mark('settings')
         if settings.get("FULLSCREEN"):
+            # Fullscreen runs at the desktop resolution; only write it back when it changed
             info = pygame.display.Info()
-            settings["WIDTH"], settings["HEIGHT"] = info.current_w, info.current_h
-            save_settings(settings)
+            if (settings["WIDTH"], settings["HEIGHT"]) != (info.current_w, info.current_h):
+                settings["WIDTH"], settings["HEIGHT"] = info.current_w, info.current_h
+                save_settings(settings)
         WIDTH, HEIGHT, FPS = settings["WIDTH"], settings["HEIGHT"], settings["FPS"]
         flags = pygame.FULLSCREEN if settings.get("FULLSCREEN") else 0
         screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
+        startup.mark('display')
         font = pygame.font.SysFont(None, 36)
+        startup.mark('font')
+        leaderboard.scores()
+        startup.mark('leaderboard')
 
         # --- UI BUTTONS ---
         button_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2, 200, 60)
         settings_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 80, 200, 50)
         quit_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 160, 200, 50)
-        waiting = True
-        settings_clock = pygame.time.Clock()
+        waiting = recording is None  # A replay skips the menu
+        repaint = True
+        shown_scores = None  # Leaderboard lines on screen
         # --- Prevent sound effects on start screen ---
         pygame.mixer.stop()
         while waiting:
-            draw_main_menu(screen, font, WIDTH, HEIGHT, button_rect, settings_rect, quit_rect, load_leaderboard)
-            pygame.display.flip()
-            for event in pygame.event.get():
+            # The menu only changes when the leaderboard does (entry_images()
+            # hands back the same list until then), so it is only drawn then
+            # or after the window was covered, and otherwise sleeps
+            if repaint or leaderboard.entry_images(font) is not shown_scores:
+                draw_main_menu(screen, font, WIDTH, HEIGHT, button_rect, settings_rect, quit_rect, leaderboard)
+                pygame.display.flip()
+                shown_scores = leaderboard.entry_images(font)
+                repaint = False
+                startup.mark('first menu frame')
+                startup.report()
+            if warming_up is None:
+                warming_up = threading.Thread(target=_warm_up, daemon=True)
+                warming_up.start()
+            for event in wait_events(int(leaderboard.recheck * 1000)):
+                if event.type in REPAINT_EVENTS:
+                    repaint = True
                 if event.type == pygame.QUIT:
                     pygame.mixer.stop()  # Stop all sounds
                     pygame.quit()
@@ -54,31 +135,46 @@ def run():
                         flags = pygame.FULLSCREEN if settings.get("FULLSCREEN") else 0
                         screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
                         font = pygame.font.SysFont(None, 36)
+                        repaint = True
                     if quit_rect.collidepoint(event.pos):
                         pygame.mixer.stop()  # Stop all sounds
                         pygame.quit()
                         return
-            settings_clock.tick(30)
 
         # --- GAME SETUP ---
-        player = Player(WIDTH // 2, HEIGHT // 2)
-        player.world_x = 0
-        player.world_y = 0
+        if warming_up is not None:
+            # Let the warm-up finish and reuse its sounds rather than bake them twice
+            warming_up.join()
+        from .enemy import generate_rotor_sound, generate_bullet_fire_sound, generate_explosion_sound, generate_crash_sound, generate_damage_sound, generate_tank_fire_sound
+        from .world import draw_ground_and_trees, draw_radar, ground_cache
+        from .pausemenu import PauseScreen
+        from .simulation import input_from_keys, TICK_RATE
+        from .audio import SoundScheduler
+        from .profiler import profiler
+        # Ground chunks are converted to the display format, so start fresh
+        ground_cache.clear()
+        ground_cache.set_budget(settings.get("GROUND_CACHE_MB", DEFAULT_SETTINGS["GROUND_CACHE_MB"]) * 1024 * 1024)
+        # Player, tanks, bullets and score all live in the simulation. This
+        # loop draws snapshots of it; with SIM_THREAD on, a worker thread runs
+        # the ticks and this loop only reads the latest snapshot
+        sim_thread = settings.get("SIM_THREAD", DEFAULT_SETTINGS["SIM_THREAD"])
+        max_tanks = settings.get("MAX_TANKS", DEFAULT_SETTINGS["MAX_TANKS"])
+        spawn_interval = settings.get("SPAWN_INTERVAL", DEFAULT_SETTINGS["SPAWN_INTERVAL"])
+        sim, worker, playback = _new_round(WIDTH, HEIGHT, sim_thread, max_tanks, spawn_interval, record, recording)
+        snap = sim.snapshot()
+        alpha = 1.0
         def get_dynamic_rotor_speed():
-            return player.rotor_speed + max(0.1, abs(player.speed)) * 120
-        rotor_sound = generate_rotor_sound(get_dynamic_rotor_speed)
-        bullet_fire_sound = generate_bullet_fire_sound()
-        explosion_sound = generate_explosion_sound()
-        crash_sound = generate_crash_sound()
-        damage_sound = generate_damage_sound()
-        tank_fire_sound = generate_tank_fire_sound()
-        # --- ENEMY SYSTEM REFACTOR ---
-        # Use a list of enemies (now tanks)
-        enemies = [EnemyTank(player.world_x, player.world_y)]
-        bullets = []
+            return sim.player.rotor_speed + max(0.1, abs(snap.speed)) * 120
+        # Effects share a pool of channels; the rotor has the reserved ones
+        audio = SoundScheduler()
+        audio.add('crash', generate_crash_sound(), priority=5, max_voices=1, positional=False)
+        audio.add('damage', generate_damage_sound(), priority=4, max_voices=1, positional=False)
+        audio.add('explosion', generate_explosion_sound(), priority=3, max_voices=4)
+        audio.add('fire', generate_bullet_fire_sound(), priority=2, max_voices=3, positional=False)
+        audio.add('tank_fire', generate_tank_fire_sound(), priority=1, max_voices=3, volume=0.6)
+        rotor_sound = generate_rotor_sound(get_dynamic_rotor_speed, fps=TICK_RATE, channels=audio.reserved)
         rotor_sound.play()
         running = True
-        score = 0
         game_over = False
         name = ""
         show_gameover_menu = False
@@ -86,294 +182,214 @@ def run():
         to_start_rect = pygame.Rect(WIDTH // 2 - 55, HEIGHT // 2 + 100, 110, 50)
         quit_rect_gameover = pygame.Rect(WIDTH // 2 + 70, HEIGHT // 2 + 100, 110, 50)
         paused = False
+        pause_screen = None  # Frozen pause menu while paused
         pause_rect_resume = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 - 120, 200, 50)
         pause_rect_restart = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 - 50, 200, 50)
         pause_rect_quit_start = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 20, 200, 50)
         pause_rect_quit_desktop = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 + 90, 200, 50)
-        # Player health system
-        player_hearts = 5
-        max_hearts = 5
-        heart_img = pygame.Surface((32, 32), pygame.SRCALPHA)
-        pygame.draw.polygon(heart_img, (255, 60, 60), [(16, 28), (2, 14), (8, 4), (16, 10), (24, 4), (30, 14)])
+        # Score and player hearts (the hearts themselves are counted by the simulation)
+        hud = Hud(font, sim.max_hearts)
         game_clock = pygame.time.Clock()
-        camera_x = player.world_x
-        camera_y = player.world_y
+        # The simulation runs fixed ticks of tick_time seconds whatever the
+        # frame rate; accumulator is the real time not yet simulated
+        tick_time = 1.0 / TICK_RATE
+        accumulator = 0.0
+        shots = 0  # SPACE presses not yet handed to a tick
         # --- Add this flag for in-game restart ---
         in_game_restart = False
-        sparks = []  # List of spark particles
-        while running:
-            game_clock.tick(FPS)
+        try:
+            while running:
+                if paused:
+                    # Nothing moves while paused, so sleep until there is input
+                    events = wait_events(250)
+                    game_clock.tick()
+                else:
+                    elapsed = game_clock.tick(FPS) / 1000
+                    events = pygame.event.get()
+                profiler.begin_frame()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
-                # Pause menu logic
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE and not game_over:
-                    paused = not paused
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        return
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        profiler.toggle()  # Frame profiler and its overlay
+                    # Pause menu logic
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE and not game_over:
+                        paused = not paused
+                        if paused:
+                            pygame.mixer.stop()  # Stop all sound effects
+                            if worker is not None:
+                                worker.pause()
                     if paused:
-                        pygame.mixer.stop()  # Stop all sound effects
-                if paused:
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if pause_rect_resume.collidepoint(event.pos):
-                            paused = False
-                        elif pause_rect_restart.collidepoint(event.pos):
-                            # --- In-game restart: reset all game state, but do not break to menu ---
-                            player = Player(WIDTH // 2, HEIGHT // 2)
-                            player.world_x = 0
-                            player.world_y = 0
-                            enemies = [EnemyTank(player.world_x, player.world_y)]
-                            bullets = []
-                            score = 0
-                            game_over = False
-                            name = ""
-                            show_gameover_menu = False
-                            paused = False
-                            camera_x = player.world_x
-                            camera_y = player.world_y
-                            continue  # Resume game immediately
-                        elif pause_rect_quit_start.collidepoint(event.pos):
-                            running = False
-                            break
-                        elif pause_rect_quit_desktop.collidepoint(event.pos):
-                            pygame.quit()
+                        if pause_screen is not None and event.type != pygame.MOUSEMOTION:
+                            pause_screen.refresh()
+                        if event.type == pygame.MOUSEBUTTONDOWN:
+                            if pause_rect_resume.collidepoint(event.pos):
+                                paused = False
+                            elif pause_rect_restart.collidepoint(event.pos):
+                                # --- In-game restart: reset all game state, but do not break to menu ---
+                                if worker is not None:
+                                    worker.stop()
+                                sim.release()
+                                sim, worker, playback = _new_round(WIDTH, HEIGHT, sim_thread, max_tanks, spawn_interval, record, recording)
+                                snap = sim.snapshot()
+                                accumulator = 0.0
+                                shots = 0
+                                game_over = False
+                                name = ""
+                                show_gameover_menu = False
+                                paused = False
+                                continue  # Resume game immediately
+                            elif pause_rect_quit_start.collidepoint(event.pos):
+                                running = False
+                                break
+                            elif pause_rect_quit_desktop.collidepoint(event.pos):
+                                return
+                        continue  # Don't process other events while paused
+                    if game_over and not show_gameover_menu and event.type == pygame.KEYDOWN:
+                        # Remove name_entered check, just allow Enter to submit
+                        if event.key == pygame.K_RETURN:
+                            add_score(name if name.strip() else "Anonymous", snap.score)
+                            show_gameover_menu = True
+                        elif event.key == pygame.K_BACKSPACE:
+                            name = name[:-1]
+                        elif event.unicode.isprintable() and len(name) < 12:
+                            name += event.unicode
+                    if game_over and show_gameover_menu and event.type == pygame.MOUSEBUTTONDOWN:
+                        if play_again_rect.collidepoint(event.pos):
+                            running = False  # break to outer loop to restart
+                        elif to_start_rect.collidepoint(event.pos):
+                            running = False  # break to outer loop, will show start screen again
+                        elif quit_rect_gameover.collidepoint(event.pos):
                             return
-                    continue  # Don't process other events while paused
-                if game_over and not show_gameover_menu and event.type == pygame.KEYDOWN:
-                    # Remove name_entered check, just allow Enter to submit
-                    if event.key == pygame.K_RETURN:
-                        add_score(name if name.strip() else "Anonymous", score)
-                        show_gameover_menu = True
-                    elif event.key == pygame.K_BACKSPACE:
-                        name = name[:-1]
-                    elif event.unicode.isprintable() and len(name) < 12:
-                        name += event.unicode
-                if game_over and show_gameover_menu and event.type == pygame.MOUSEBUTTONDOWN:
-                    if play_again_rect.collidepoint(event.pos):
-                        running = False  # break to outer loop to restart
-                    elif to_start_rect.collidepoint(event.pos):
-                        running = False  # break to outer loop, will show start screen again
-                    elif quit_rect_gameover.collidepoint(event.pos):
-                        pygame.quit()
-                        return
-                if not game_over and event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        bullet_length = player.player_width // 2
-                        rad = math.radians(player.angle)
-                        world_bullet_x = player.world_x + math.cos(rad) * bullet_length
-                        world_bullet_y = player.world_y - math.sin(rad) * bullet_length
-                        # Create a player bullet as a simple dict/object
-                        bullet = type('PlayerBullet', (), {})()
-                        bullet.length = 16
-                        bullet.width = 4
-                        # Create a gradient bullet: transparent at tip, fully opaque yellow at back
-                        base_image = pygame.Surface((bullet.length, bullet.width), pygame.SRCALPHA)
-                        for i in range(bullet.length):
-                            alpha = int(255 * (i / bullet.length))
-                            color = (255, 255, 0, alpha)
-                            pygame.draw.line(base_image, color, (i, 0), (i, bullet.width-1))
-                        bullet.image = pygame.transform.rotate(base_image, player.angle)
-                        bullet.rect = bullet.image.get_rect(center=(world_bullet_x, world_bullet_y))
-                        bullet.angle = player.angle
-                        bullet.speed = 16
-                        rad = math.radians(bullet.angle)
-                        bullet.vx = math.cos(rad) * bullet.speed
-                        bullet.vy = -math.sin(rad) * bullet.speed
-                        bullet.world_x = world_bullet_x
-                        bullet.world_y = world_bullet_y
-                        bullet.get_world_rect = lambda b=bullet: pygame.Rect(b.world_x - b.length // 2, b.world_y - b.width // 2, b.length, b.width)
-                        bullet.update = lambda b=bullet: (setattr(b, 'world_x', b.world_x + b.vx), setattr(b, 'world_y', b.world_y + b.vy))
-                        bullet.draw = lambda screen, camera_x, camera_y, WIDTH, HEIGHT, b=bullet: screen.blit(b.image, b.image.get_rect(center=(int(b.world_x - camera_x + WIDTH // 2), int(b.world_y - camera_y + HEIGHT // 2))))
-                        bullets.append(bullet)
-                        bullet_fire_sound.play()
-        # --- Update rotor sound pitch and volume based on player speed ---
-            speed_ratio = abs(player.speed) / player.max_speed
-            rotor_sound.set_volume(0.22 + 0.38 * speed_ratio)  # Lower base volume when stationary
-            rotor_sound.set_pitch(0.7 + 0.6 * speed_ratio)  # Lower pitch overall
+                    if not game_over and event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_SPACE:
+                            shots += 1
+                if paused:
+                    # Sounds were stopped on pausing and nothing restarts them here
+                    if pause_screen is None:
+                        pause_screen = PauseScreen(screen, (pause_rect_resume, pause_rect_restart, pause_rect_quit_start, pause_rect_quit_desktop))
+                    if pause_screen.draw(screen, font, WIDTH, HEIGHT, pygame.mouse.get_pos()):
+                        pygame.display.flip()
+                    continue  # Skip game update/draw while paused
+                if pause_screen is not None:
+                    elapsed = 0.0  # Just resumed: the time spent paused doesn't count
+                    if worker is not None:
+                        worker.resume()
+                pause_screen = None
 
-            if paused:
-                pygame.mixer.stop()  # Stop all sounds
-                draw_pause_menu(screen, font, WIDTH, HEIGHT, pause_rect_resume, pause_rect_restart, pause_rect_quit_start, pause_rect_quit_desktop)
-                pygame.display.flip()
-                continue  # Skip game update/draw while paused
+            # --- Update rotor sound pitch and volume based on player speed ---
+                player = sim.player
+                speed_ratio = abs(snap.speed) / player.max_speed
+                rotor_sound.set_volume(0.22 + 0.38 * speed_ratio)  # Lower base volume when stationary
+                rotor_sound.set_pitch(0.7 + 0.6 * speed_ratio)  # Lower pitch overall
 
-            if not game_over:
-                keys = pygame.key.get_pressed()
-                # Only update player.world_x/world_y by input
-                prev_world_x = player.world_x
-                prev_world_y = player.world_y
-                # Calculate movement from input (copy from Player.update, but don't move player.pos)
-                move = 0
-                if keys[pygame.K_UP] or keys[pygame.K_w]:
-                    move = 1
-                if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-                    move = -1
-                if move != 0:
-                    player.speed += player.acceleration * move
-                else:
-                    player.speed *= 0.92
-                if player.speed > player.max_speed:
-                    player.speed = player.max_speed
-                if player.speed < -player.max_speed:
-                    player.speed = -player.max_speed
-                # Rotation
-                if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                    player.angle += player.rotation_speed
-                if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                    player.angle -= player.rotation_speed
-                rad = math.radians(player.angle)
-                dx = math.cos(rad) * player.speed
-                dy = -math.sin(rad) * player.speed
-                player.world_x += dx
-                player.world_y += dy
-                # Camera always follows player
-                camera_x = player.world_x
-                camera_y = player.world_y
-                # Animate rotor and update image
-                player.rotor_angle = (player.rotor_angle + player.rotor_speed) % 360
-                player.image = player.body_image.copy()
-                center = (player.rotor_diameter // 2, player.rotor_diameter // 2)
-                blade_length = int(player.rotor_radius * 0.95)
-                blade_width = 8
-                blade_color = (60, 60, 60, 180)
-                for i in range(3):
-                    angle = player.rotor_angle + i * 120
-                    rad_blade = math.radians(angle)
-                    x2 = center[0] + math.cos(rad_blade) * blade_length
-                    y2 = center[1] + math.sin(rad_blade) * blade_length
-                    pygame.draw.line(player.image, blade_color, center, (x2, y2), blade_width)
-                player.image = pygame.transform.rotate(player.image, player.angle)
-                player.rect = player.image.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-                # Update bullets in world space
-                for bullet in bullets[:]:
-                    bullet.update()
-                    screen_x = bullet.world_x - camera_x + WIDTH // 2
-                    screen_y = bullet.world_y - camera_y + HEIGHT // 2
-                    if (
-                        screen_x < -100 or screen_x > WIDTH + 100 or
-                        screen_y < -100 or screen_y > HEIGHT + 100
-                    ):
-                        bullets.remove(bullet)
-                # Update all enemies (tanks)
-                for enemy in enemies[:]:
-                    result = enemy.update(player.world_x, player.world_y, WIDTH, HEIGHT)
-                    if result == 'remove':
-                        enemies.remove(enemy)
-                # --- Bullet-enemy collision (player bullets hit tank) ---
-                hits = []
-                for bullet in bullets[:]:
-                    for enemy in enemies:
-                        if not getattr(enemy, 'exploding', False) and enemy.get_world_rect().colliderect(bullet.get_world_rect()):
-                            hits.append((bullet, enemy))
-                for bullet, enemy in hits:
-                    bullets.remove(bullet)
-                    score += 1
-                    explosion_sound.play()
-                    enemy.start_explode()
-                    # When tank is hit, spawn 2 new tanks outside radar
-                    avoid_positions = [(player.world_x, player.world_y)] + [(e.world_x, e.world_y) for e in enemies]
-                    for _ in range(2):
-                        new_enemy = EnemyTank(player.world_x, player.world_y, spawn_outside_radar=True, radar_radius=3600, pause_time=FPS*10, avoid_positions=avoid_positions)
-                        enemies.append(new_enemy)
-                        avoid_positions.append((new_enemy.world_x, new_enemy.world_y))
-                # Remove exploded tanks after animation
-                for enemy in enemies[:]:
-                    if getattr(enemy, 'exploding', False):
-                        result = enemy.update(player.world_x, player.world_y, WIDTH, HEIGHT)
-                        if result == 'remove':
-                            enemies.remove(enemy)
-                # --- Tank bullet hits player ---
-                player_rect = pygame.Rect(player.world_x - player.player_width // 2, player.world_y - player.player_height // 2, player.player_width, player.player_height)
-                for enemy in enemies:
-                    for bullet in enemy.bullets[:]:
-                        if player_rect.colliderect(bullet.get_world_rect()):
-                            enemy.bullets.remove(bullet)
-                            player_hearts -= 1
-                            damage_sound.play()
-                            # Spawn sparks
-                            for _ in range(12):
-                                angle = random.uniform(-0.7, 0.7)
-                                speed = random.uniform(6, 13)
-                                vx = math.cos(angle + math.pi/2) * speed
-                                vy = -abs(math.sin(angle + math.pi/2) * speed)
-                                sparks.append({
-                                    'x': player.world_x,
-                                    'y': player.world_y - 10,
-                                    'vx': vx,
-                                    'vy': vy,
-                                    'life': random.randint(10, 18),
-                                    'color': (255, random.randint(180,220), 60)
-                                })
-                            if player_hearts <= 0:
-                                game_over = True
-                                rotor_sound.stop()
-                                crash_sound.play()
-                                show_gameover_menu = False
-            # Draw ground and trees (world background)
-            draw_ground_and_trees(screen, camera_x, camera_y, WIDTH, HEIGHT)
-            # Draw all enemies (tanks)
-            for enemy in enemies:
-                enemy.draw(screen, camera_x, camera_y, WIDTH, HEIGHT)
-            # Draw bullets
-            for bullet in bullets:
-                bullet.draw(screen, camera_x, camera_y, WIDTH, HEIGHT)
-            # Draw player (always centered)
-            screen.blit(player.image, player.rect)
-            # Draw radar (after world, before UI)
-            draw_radar(screen, player.world_x, player.world_y, enemies, WIDTH, HEIGHT)
-            # Display score
-            score_text = font.render(f"Score: {score}", True, (255, 255, 255))
-            screen.blit(score_text, (10, 10))
-            # Draw player hearts
-            for i in range(max_hearts):
-                x = 20 + i * 38
-                y = 54
-                if i < player_hearts:
-                    screen.blit(heart_img, (x, y))
-                else:
-                    pygame.draw.polygon(screen, (120, 120, 120), [(x+16, y+28), (x+2, y+14), (x+8, y+4), (x+16, y+10), (x+24, y+4), (x+30, y+14)], 2)
-            # Draw sparks
-            for spark in sparks[:]:
-                sx = int(spark['x'] - camera_x + WIDTH // 2)
-                sy = int(spark['y'] - camera_y + HEIGHT // 2)
-                pygame.draw.circle(screen, spark['color'], (sx, sy), 3)
-                spark['x'] += spark['vx']
-                spark['y'] += spark['vy']
-                spark['vy'] += 1.2  # gravity
-                spark['life'] -= 1
-                if spark['life'] <= 0:
-                    sparks.remove(spark)
+                profiler.lap('input')
+                if not game_over:
+                    keys = pygame.key.get_pressed()
+                    if worker is not None:
+                        worker.feed(input_from_keys(keys, shots))
+                        shots = 0
+                        events = worker.events()
+                        snap, alpha = worker.latest()
+                    else:
+                        # Run every tick the elapsed time covers (none on a fast
+                        # frame, several on a slow one); keys are read once per frame
+                        accumulator = min(accumulator + elapsed, MAX_CATCH_UP)
+                        events = []
+                        while accumulator >= tick_time and not sim.game_over:
+                            if playback is not None:
+                                if playback.finished:
+                                    break
+                                tick_input = playback.next_input()
+                            else:
+                                tick_input = input_from_keys(keys, shots)
+                            accumulator -= tick_time
+                            events += sim.step(tick_input)
+                            shots = 0
+                        snap = sim.snapshot()
+                        # Draw part of the way from the previous tick to the latest
+                        # one, by how much of the next tick has already elapsed
+                        alpha = min(accumulator / tick_time, 1.0)
+                    # The ticks lap their own phases; this is the copy (or the
+                    # hand-over from the worker) and the sounds
+                    profiler.lap('snapshot')
+                    for event in events:
+                        audio.trigger(event.kind, event.x, event.y)
+                        if event.kind == 'crash':
+                            game_over = True
+                            rotor_sound.stop()
+                            show_gameover_menu = False
+                    audio.flush(snap.player_x, snap.player_y)
+                    profiler.lap('audio')
+                camera_x, camera_y, view_angle = snap.view(alpha)
+                player.pose((WIDTH // 2, HEIGHT // 2), view_angle, snap.rotor_angle)
+                # Draw ground and trees (world background)
+                draw_ground_and_trees(screen, camera_x, camera_y, WIDTH, HEIGHT)
+                profiler.lap('ground')
+                # Draw the tanks (this and the draws below skip what is out of view
+                # and return how much they drew, for the profiler)
+                tanks_drawn, tank_bullets_drawn = snap.tanks.draw(screen, camera_x, camera_y, WIDTH, HEIGHT, alpha)
+                particles_drawn = snap.explosions.draw(screen, camera_x, camera_y, WIDTH, HEIGHT, alpha)
+                profiler.lap('enemy draw')
+                # Draw bullets
+                bullets_drawn = snap.bullets.draw(screen, camera_x, camera_y, WIDTH, HEIGHT, alpha)
+                # Draw player (always centered)
+                screen.blit(player.image, player.rect)
+                # Draw radar (after world, before UI)
+                profiler.lap('sprites')
+                draw_radar(screen, camera_x, camera_y, snap.tanks, WIDTH, HEIGHT)
+                profiler.lap('radar')
+                # Display score and player hearts
+                hud.draw(screen, snap.score, snap.hearts)
+                # Draw sparks
+                particles_drawn += snap.sparks.draw(screen, camera_x, camera_y, WIDTH, HEIGHT, alpha)
+                profiler.draw_overlay(screen)
+                profiler.lap('hud')
 
-            if game_over and not show_gameover_menu:
-                pygame.mixer.stop()  # Stop all sounds
-                name, result = show_score_entry_screen(screen, font, WIDTH, HEIGHT, score)
-                # Use 'Anonymous' if name is empty or only whitespace
-                add_score(name if name.strip() else "Anonymous", score)
-                show_gameover_menu = True
-                if result == 'quit':
-                    pygame.mixer.stop()  # Stop all sounds
-                    pygame.quit()
+                if playback is not None and (game_over or snap.tick >= len(playback.recording.inputs)):
+                    # A replay ends with its last recorded tick, without a score
+                    print(f"Replay finished at tick {snap.tick}, score {snap.score}")
+                    pygame.mixer.stop()
                     return
-                # Immediately break out of the inner game loop to return to the start screen
-                running = False
-                break
-            if game_over and show_gameover_menu:
-                final_score = font.render(f"Your Score: {score}", True, (255, 255, 255))
-                screen.blit(final_score, (WIDTH // 2 - final_score.get_width() // 2, HEIGHT // 2 + 10))
-                pygame.draw.rect(screen, (0, 120, 0), play_again_rect, border_radius=8)
-                pygame.draw.rect(screen, (120, 120, 0), to_start_rect, border_radius=8)
-                pygame.draw.rect(screen, (120, 0, 0), quit_rect_gameover, border_radius=8)
-                again_text = font.render("Play Again", True, (255, 255, 255))
-                start_text = font.render("To Start", True, (255, 255, 255))
-                quit_text = font.render("Quit", True, (255, 255, 255))
-                screen.blit(again_text, (play_again_rect.centerx - again_text.get_width() // 2, play_again_rect.centery - again_text.get_height() // 2))
-                screen.blit(start_text, (to_start_rect.centerx - start_text.get_width() // 2, to_start_rect.centery - start_text.get_height() // 2))
-                screen.blit(quit_text, (quit_rect_gameover.centerx - quit_text.get_width() // 2, quit_rect_gameover.centery - quit_text.get_height() // 2))
+                if game_over and not show_gameover_menu:
+                    pygame.mixer.stop()  # Stop all sounds
+                    name, result = show_score_entry_screen(screen, font, WIDTH, HEIGHT, snap.score)
+                    # Use 'Anonymous' if name is empty or only whitespace
+                    add_score(name if name.strip() else "Anonymous", snap.score)
+                    show_gameover_menu = True
+                    if result == 'quit':
+                        pygame.mixer.stop()  # Stop all sounds
+                        return
+                    # Immediately break out of the inner game loop to return to the start screen
+                    running = False
+                    break
+                if game_over and show_gameover_menu:
+                    final_score = render_text(font, f"Your Score: {snap.score}", (255, 255, 255))
+                    screen.blit(final_score, (WIDTH // 2 - final_score.get_width() // 2, HEIGHT // 2 + 10))
+                    pygame.draw.rect(screen, (0, 120, 0), play_again_rect, border_radius=8)
+                    pygame.draw.rect(screen, (120, 120, 0), to_start_rect, border_radius=8)
+                    pygame.draw.rect(screen, (120, 0, 0), quit_rect_gameover, border_radius=8)
+                    again_text = render_text(font, "Play Again", (255, 255, 255))
+                    start_text = render_text(font, "To Start", (255, 255, 255))
+                    quit_text = render_text(font, "Quit", (255, 255, 255))
+                    screen.blit(again_text, (play_again_rect.centerx - again_text.get_width() // 2, play_again_rect.centery - again_text.get_height() // 2))
+                    screen.blit(start_text, (to_start_rect.centerx - start_text.get_width() // 2, to_start_rect.centery - start_text.get_height() // 2))
+                    screen.blit(quit_text, (quit_rect_gameover.centerx - quit_text.get_width() // 2, quit_rect_gameover.centery - quit_text.get_height() // 2))
 
-            pygame.display.flip()
-            if not running:
-                pygame.mixer.stop()  # Stop all sounds
-                break
+                pygame.display.flip()
+                profiler.lap('flip')
+                if profiler.enabled:
+                    profiler.end_frame(**snap.counts(), tanks_drawn=tanks_drawn, bullets_drawn=bullets_drawn + tank_bullets_drawn,
+                                       particles_drawn=particles_drawn)
+                if not running:
+                    pygame.mixer.stop()  # Stop all sounds
+                    break
+        finally:
+            # Every way out of the round joins the worker before pygame shuts down
+            if worker is not None:
+                worker.stop()
+            sim.release()
 
     pygame.mixer.stop()  # Stop all sounds on final quit
     pygame.quit()
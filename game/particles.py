@@ -0,0 +1,125 @@
+import numpy as np
+import pygame
+from .assets import for_display
+
+def render_circle(radius, color):
+    # Filled circle centred on the surface, same pixels as pygame.draw.circle
+    size = radius * 2 + 2
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(image, color, (size // 2, size // 2), radius)
+    return image
+
+class _ParticleDrawing:
+    # draw() for anything with frames, half, sizes, count and the
+    # x, y, prev_x, prev_y and frame columns of a ParticleSystem
+    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT, alpha=1.0):
+        # alpha: how far to draw between the previous and the latest tick;
+        # returns how many particles were in view and drawn
+        n = self.count
+        if n == 0:
+            return 0
+        frame = self.frame[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        if alpha != 1.0:
+            x = x + (self.prev_x[:n] - x) * (1 - alpha)
+            y = y + (self.prev_y[:n] - y) * (1 - alpha)
+        # Truncate like int() did for the old per-particle draws
+        left = (x - camera_x + WIDTH // 2).astype(np.int64) - self.half[frame, 0]
+        top = (y - camera_y + HEIGHT // 2).astype(np.int64) - self.half[frame, 1]
+        visible = np.flatnonzero((left < WIDTH) & (top < HEIGHT) &
+                                 (left + self.sizes[frame, 0] > 0) & (top + self.sizes[frame, 1] > 0))
+        if len(visible) == 0:
+            return 0
+        frames = self.frames
+        screen.blits([(frames[f], (l, t)) for f, l, t in zip(frame[visible].tolist(), left[visible].tolist(), top[visible].tolist())], doreturn=False)
+        return len(visible)
+
+class ParticleSystem(_ParticleDrawing):
+    """
+    Short-lived world-space effects (sparks, explosions) in fixed-capacity
+    NumPy columns. Each particle shows one sprite from the system's frame
+    table, centred on its position, and moves on to the next frame_step
+    frames every tick. update() integrates every particle at once and
+    swap-removes dead ones; draw() hands all visible sprites to one blits()
+    call. Emitting into a full system drops the new particles. Positions
+    from before the last update() are kept, so draw() can interpolate
+    between ticks.
+    """
+    def __init__(self, frames, capacity=1024, gravity=0.0):
+        self.frames = [for_display(frame) for frame in frames]
+        sizes = np.array([frame.get_size() for frame in self.frames], dtype=np.int64)
+        self.half = sizes // 2
+        self.sizes = sizes
+        self.capacity = capacity
+        self.gravity = gravity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.frame = np.zeros(capacity, dtype=np.int32)
+        self.frame_step = np.zeros(capacity, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, vx=0.0, vy=0.0, life=1, frame=0, frame_step=0):
+        """Add particles; every argument is a scalar or an array of one length."""
+        total = max(np.size(a) for a in (x, y, vx, vy, life, frame, frame_step))
+        n = min(total, self.capacity - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        for column, value in ((self.x, x), (self.y, y), (self.prev_x, x), (self.prev_y, y), (self.vx, vx), (self.vy, vy),
+                              (self.life, life), (self.frame, frame), (self.frame_step, frame_step)):
+            column[s] = np.broadcast_to(value, (total,))[:n]
+        self.count += n
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        if self.gravity:
+            self.vy[:n] += self.gravity
+        self.life[:n] -= 1
+        frame = self.frame[:n]
+        frame += self.frame_step[:n]
+        np.minimum(frame, len(self.frames) - 1, out=frame)
+        alive = self.life[:n] > 0
+        live = int(np.count_nonzero(alive))
+        if live == n:
+            return
+        # Fill the holes below the new count with the survivors above it
+        holes = np.flatnonzero(~alive[:live])
+        movers = np.flatnonzero(alive[live:]) + live
+        for column in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy, self.life, self.frame, self.frame_step):
+            column[holes] = column[movers]
+        self.count = live
+
+    def snapshot(self):
+        return ParticleSnapshot(self)
+
+class ParticleSnapshot(_ParticleDrawing):
+    """Frozen copy of a ParticleSystem's live particles, drawn the same way."""
+    def __init__(self, system):
+        n = system.count
+        self.frames = system.frames
+        self.half = system.half
+        self.sizes = system.sizes
+        self.count = n
+        for name in ('x', 'y', 'prev_x', 'prev_y', 'frame'):
+            setattr(self, name, getattr(system, name)[:n].copy())
+
+    def __len__(self):
+        return self.count
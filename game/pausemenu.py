@@ -1,21 +1,59 @@
 # --- pausemenu.py ---
 import pygame
+from .text import render_text
 
-def draw_pause_menu(screen, font, WIDTH, HEIGHT, pause_rect_resume, pause_rect_restart, pause_rect_quit_start, pause_rect_quit_desktop):
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+def _lighten(color, amount=40):
+    return tuple(min(255, c + amount) for c in color)
+
+def darken_frame(screen):
+    # Copy of the current frame under the pause menu's black veil
+    frame = screen.copy()
+    overlay = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
-    pause_text = font.render("PAUSED", True, (255, 255, 0))
+    frame.blit(overlay, (0, 0))
+    return frame
+
+def draw_pause_menu(screen, font, WIDTH, HEIGHT, pause_rect_resume, pause_rect_restart, pause_rect_quit_start, pause_rect_quit_desktop, background=None, hovered=None):
+    # background: a darken_frame() snapshot to show instead of veiling the screen again
+    if background is None:
+        background = darken_frame(screen)
+    screen.blit(background, (0, 0))
+    pause_text = render_text(font, "PAUSED", (255, 255, 0))
     screen.blit(pause_text, (WIDTH // 2 - pause_text.get_width() // 2, HEIGHT // 2 - 180))
-    pygame.draw.rect(screen, (0, 120, 0), pause_rect_resume, border_radius=10)
-    pygame.draw.rect(screen, (0, 100, 200), pause_rect_restart, border_radius=10)
-    pygame.draw.rect(screen, (120, 120, 0), pause_rect_quit_start, border_radius=10)
-    pygame.draw.rect(screen, (120, 0, 0), pause_rect_quit_desktop, border_radius=10)
-    resume_text = font.render("Resume", True, (255, 255, 255))
-    restart_text = font.render("Restart", True, (255, 255, 255))
-    main_menu_text = font.render("Main Menu", True, (255, 255, 255))
-    quit_desktop_text = font.render("Quit to Desktop", True, (255, 255, 255))
-    screen.blit(resume_text, (pause_rect_resume.centerx - resume_text.get_width() // 2, pause_rect_resume.centery - resume_text.get_height() // 2))
-    screen.blit(restart_text, (pause_rect_restart.centerx - restart_text.get_width() // 2, pause_rect_restart.centery - restart_text.get_height() // 2))
-    screen.blit(main_menu_text, (pause_rect_quit_start.centerx - main_menu_text.get_width() // 2, pause_rect_quit_start.centery - main_menu_text.get_height() // 2))
-    screen.blit(quit_desktop_text, (pause_rect_quit_desktop.centerx - quit_desktop_text.get_width() // 2, pause_rect_quit_desktop.centery - quit_desktop_text.get_height() // 2))
\ No newline at end of file
+    buttons = [
+        (pause_rect_resume, (0, 120, 0), "Resume"),
+        (pause_rect_restart, (0, 100, 200), "Restart"),
+        (pause_rect_quit_start, (120, 120, 0), "Main Menu"),
+        (pause_rect_quit_desktop, (120, 0, 0), "Quit to Desktop"),
+    ]
+    for rect, color, label in buttons:
+        pygame.draw.rect(screen, _lighten(color) if rect is hovered else color, rect, border_radius=10)
+        text = render_text(font, label, (255, 255, 255))
+        screen.blit(text, (rect.centerx - text.get_width() // 2, rect.centery - text.get_height() // 2))
+
+class PauseScreen:
+    """
+    The pause menu over a frozen, darkened copy of the frame that was on
+    screen when the game paused. draw() only repaints when the hovered
+    button changes or it is told that something happened (refresh()).
+    """
+    def __init__(self, screen, rects):
+        self.background = darken_frame(screen)
+        self.rects = rects  # resume, restart, main menu, quit to desktop
+        self.hovered = None
+        self.dirty = True
+
+    def refresh(self):
+        self.dirty = True
+
+    def draw(self, screen, font, WIDTH, HEIGHT, mouse_pos):
+        """Repaint if needed; returns True if the screen changed."""
+        hovered = next((rect for rect in self.rects if rect.collidepoint(mouse_pos)), None)
+        if hovered is not self.hovered:
+            self.hovered = hovered
+            self.dirty = True
+        if not self.dirty:
+            return False
+        draw_pause_menu(screen, font, WIDTH, HEIGHT, *self.rects, background=self.background, hovered=hovered)
+        self.dirty = False
+        return True
@@ -1,5 +1,131 @@
 import pygame
 import math
+from collections import OrderedDict
+from .assets import cached_image, for_display
+
+def render_player_body(size, body_x, body_y, width, height):
+    # Static body (NO rotor oval/circle) on a canvas large enough for the rotor
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.ellipse(image, (0, 180, 255), (body_x, body_y, width, height))
+    pygame.draw.rect(image, (0, 100, 200), (body_x + 40, body_y + 10, 15, 10), border_radius=3)
+    return image
+
+def render_bullet_gradient(length, width):
+    # Gradient bullet: transparent at tip, fully opaque yellow at back
+    image = pygame.Surface((length, width), pygame.SRCALPHA)
+    for i in range(length):
+        alpha = int(255 * (i / length))
+        pygame.draw.line(image, (255, 255, 0, alpha), (i, 0), (i, width - 1))
+    return image
+
+class PlayerSpriteAtlas:
+    """
+    Rotated body + rotor frames keyed by (rotor phase, heading). The rotor turns
+    in fixed rotor_step increments and the heading in heading_step increments,
+    so only a small, finite set of frames exists; they are rendered on first
+    use and kept in an LRU cache of at most max_frames surfaces.
+    """
+    def __init__(self, body_image, rotor_radius, rotor_step=18, heading_step=4, max_frames=360):
+        self.body_image = body_image
+        self.rotor_radius = rotor_radius
+        self.rotor_step = rotor_step
+        self.heading_step = heading_step
+        self.rotor_phases = round(360 / rotor_step)
+        self.headings = round(360 / heading_step)
+        self.max_frames = max_frames
+        self.frames = OrderedDict()  # (phase, heading) -> surface
+
+    def frame(self, rotor_angle, angle):
+        key = (round(rotor_angle / self.rotor_step) % self.rotor_phases, round(angle / self.heading_step) % self.headings)
+        image = self.frames.get(key)
+        if image is not None:
+            self.frames.move_to_end(key)
+            return image
+        image = self._render(key[0] * self.rotor_step, key[1] * self.heading_step)
+        self.frames[key] = image
+        if len(self.frames) > self.max_frames:
+            self.frames.popitem(last=False)
+        return image
+
+    def _render(self, rotor_angle, angle):
+        # Start from static body, then draw spinning blades and rotate
+        image = self.body_image.copy()
+        size = image.get_width()
+        center = (size // 2, size // 2)
+        blade_length = int(self.rotor_radius * 0.95)
+        blade_width = 8
+        blade_color = (60, 60, 60, 180)
+        for i in range(3):
+            rad = math.radians(rotor_angle + i * 120)
+            x2 = center[0] + math.cos(rad) * blade_length
+            y2 = center[1] + math.sin(rad) * blade_length
+            pygame.draw.line(image, blade_color, center, (x2, y2), blade_width)
+        return for_display(pygame.transform.rotate(image, angle))
+
+class PlayerBullet:
+    """
+    A player shot. Bullets come from PlayerBullet.fire(), which recycles
+    released instances from a pool, and all bullets with the same heading
+    share one pre-rotated gradient image.
+    """
+    __slots__ = ('world_x', 'world_y', 'prev_x', 'prev_y', 'vx', 'vy', 'angle', 'image', 'rect', 'world_rect')
+    length = 16
+    width = 4
+    speed = 16
+    _images = {}  # heading in degrees -> rotated gradient
+    _pool = []
+
+    def __init__(self):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.world_rect = pygame.Rect(0, 0, self.length, self.width)
+
+    @classmethod
+    def image_for(cls, angle):
+        heading = angle % 360
+        image = cls._images.get(heading)
+        if image is None:
+            base_image = cached_image(render_bullet_gradient, length=cls.length, width=cls.width)
+            image = for_display(pygame.transform.rotate(base_image, heading))
+            cls._images[heading] = image
+        return image
+
+    @classmethod
+    def fire(cls, world_x, world_y, angle):
+        bullet = cls._pool.pop() if cls._pool else cls()
+        bullet.world_x = bullet.prev_x = world_x
+        bullet.world_y = bullet.prev_y = world_y
+        bullet.angle = angle
+        rad = math.radians(angle)
+        bullet.vx = math.cos(rad) * cls.speed
+        bullet.vy = -math.sin(rad) * cls.speed
+        bullet.image = cls.image_for(angle)
+        bullet.rect.size = bullet.image.get_size()
+        return bullet
+
+    def release(self):
+        # Hand the bullet back for reuse; the caller must drop its reference
+        self._pool.append(self)
+
+    def update(self):
+        self.prev_x = self.world_x
+        self.prev_y = self.world_y
+        self.world_x += self.vx
+        self.world_y += self.vy
+
+    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT, alpha=1.0):
+        # alpha: how far to draw between the previous and the latest tick
+        x = self.world_x + (self.prev_x - self.world_x) * (1 - alpha)
+        y = self.world_y + (self.prev_y - self.world_y) * (1 - alpha)
+        self.rect.center = (int(x - camera_x + WIDTH // 2), int(y - camera_y + HEIGHT // 2))
+        screen.blit(self.image, self.rect)
+
+    def get_world_rect(self):
+        # Updated in place; copy it if you need to keep it
+        self.world_rect.topleft = (self.world_x - self.length // 2, self.world_y - self.width // 2)
+        return self.world_rect
+
+# Every Player looks the same, so all of them share one atlas
+_sprite_atlas = None
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, x=100, y=100):
@@ -16,9 +142,12 @@ class Player(pygame.sprite.Sprite):
         self.body_x = self.rotor_diameter // 2 - self.player_width // 2
         self.body_y = self.rotor_diameter // 2 - self.player_height // 2
         # Pre-render static body (NO rotor oval/circle)
-        self.body_image = pygame.Surface((self.rotor_diameter, self.rotor_diameter), pygame.SRCALPHA)
-        pygame.draw.ellipse(self.body_image, (0, 180, 255), (self.body_x, self.body_y, self.player_width, self.player_height))
-        pygame.draw.rect(self.body_image, (0, 100, 200), (self.body_x + 40, self.body_y + 10, 15, 10), border_radius=3)
+        self.body_image = cached_image(render_player_body, size=self.rotor_diameter, body_x=self.body_x,
+                                       body_y=self.body_y, width=self.player_width, height=self.player_height)
+        global _sprite_atlas
+        if _sprite_atlas is None:
+            _sprite_atlas = PlayerSpriteAtlas(self.body_image, self.rotor_radius)
+        self.atlas = _sprite_atlas
         self.image = self.body_image.copy()
         # The body_rect is used for collisions and position, not the full image
         self.body_rect = pygame.Rect(self.body_x, self.body_y, self.player_width, self.player_height)
@@ -29,10 +158,10 @@ class Player(pygame.sprite.Sprite):
         self.speed = 0
         self.max_speed = 7
         self.acceleration = 0.5
-        self.rotation_speed = 4  # degrees per frame
+        self.rotation_speed = 4  # degrees per tick
         # Rotor animation
         self.rotor_angle = 0
-        self.rotor_speed = 18  # degrees per frame
+        self.rotor_speed = 18  # degrees per tick
 
     def update(self, keys):
         # Rotation
@@ -65,20 +194,18 @@ class Player(pygame.sprite.Sprite):
         self.pos.y += dy
         # Update only the body_rect's center for collisions
         self.body_rect.center = (int(self.pos.x), int(self.pos.y))
-        # Animate rotor
+        self.animate(self.body_rect.center)
+
+    def animate(self, center):
+        self.spin()
+        self.pose(center)
+
+    def spin(self):
+        # Advance the rotor one tick
         self.rotor_angle = (self.rotor_angle + self.rotor_speed) % 360
-        # Redraw image: start from static body, then draw spinning blades
-        self.image = self.body_image.copy()
-        center = (self.rotor_diameter // 2, self.rotor_diameter // 2)
-        blade_length = int(self.rotor_radius * 0.95)
-        blade_width = 8
-        blade_color = (60, 60, 60, 180)
-        for i in range(3):
-            angle = self.rotor_angle + i * 120
-            rad = math.radians(angle)
-            x2 = center[0] + math.cos(rad) * blade_length
-            y2 = center[1] + math.sin(rad) * blade_length
-            pygame.draw.line(self.image, blade_color, center, (x2, y2), blade_width)
-        # Rotate image and update self.rect for drawing
-        self.image = pygame.transform.rotate(self.image, self.angle)
-        self.rect = self.image.get_rect(center=self.body_rect.center)
+
+    def pose(self, center, angle=None, rotor_angle=None):
+        # Pick the pre-rendered frame for a heading and rotor position (default: the current ones)
+        self.image = self.atlas.frame(self.rotor_angle if rotor_angle is None else rotor_angle, self.angle if angle is None else angle)
+        self.rect.size = self.image.get_size()
+        self.rect.center = center
@@ -0,0 +1,155 @@
+import csv
+import json
+import time
+import numpy as np
+import pygame
+
+class FrameProfiler:
+    """
+    Per-phase frame timings. A frame is split into consecutive phases:
+    begin_frame() starts the clock and each lap(name) charges the time since
+    the previous lap to name (laps with the same name add up). end_frame()
+    stores the frame, plus any entity counts, in a ring buffer of the last
+    history frames.
+
+    While disabled, lap() is a no-op, so the calls can stay in the hot path.
+
+    ticks may hold a second profiler timing the simulation's ticks on their
+    own thread (see worker.py); the overlay lists its phases per tick below
+    the frame's.
+    """
+    def __init__(self, history=3600, max_phases=24):
+        self.history = history
+        self.phases = []  # Column order of samples
+        self.columns = {}
+        self.count_names = []
+        self.samples = np.zeros((history, max_phases))
+        self.counts = np.zeros((history, max_phases), dtype=np.int64)
+        self.frames = 0  # Frames recorded so far
+        self.current = [0.0] * max_phases
+        self.last = 0.0
+        self.enabled = False
+        self.font = None
+        self._overlay = None
+        self._overlay_frame = -1
+        self.lap = self._skip
+        self.ticks = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.lap = self._lap if enabled else self._skip
+        self._overlay = None
+        self.begin_frame()  # Turned on mid-frame: time the rest of it
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def _skip(self, name):
+        pass
+
+    def _lap(self, name):
+        now = time.perf_counter()
+        column = self.columns.get(name)
+        if column is None:
+            if len(self.phases) == len(self.current):
+                return  # Out of columns; ignore new phase names
+            column = self.columns[name] = len(self.phases)
+            self.phases.append(name)
+        self.current[column] += now - self.last
+        self.last = now
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = [0.0] * len(self.current)
+        self.last = time.perf_counter()
+
+    def end_frame(self, **counts):
+        if not self.enabled:
+            return
+        row = self.frames % self.history
+        self.samples[row] = self.current
+        for name, value in counts.items():
+            if name not in self.count_names:
+                if len(self.count_names) == self.counts.shape[1]:
+                    continue
+                self.count_names.append(name)
+            self.counts[row, self.count_names.index(name)] = value
+        self.frames += 1
+
+    def _recorded(self):
+        # Row indices of the stored frames, oldest first
+        n = min(self.frames, self.history)
+        return (np.arange(self.frames - n, self.frames) % self.history)
+
+    def percentiles(self, q=(50, 95, 99)):
+        """{phase: [ms at each percentile in q]} over the stored frames."""
+        rows = self._recorded()
+        if len(rows) == 0:
+            return {}
+        ms = np.percentile(self.samples[rows, :len(self.phases)] * 1000, q, axis=0)
+        stats = {name: ms[:, i].tolist() for i, name in enumerate(self.phases)}
+        stats['frame'] = np.percentile(self.samples[rows].sum(axis=1) * 1000, q).tolist()
+        return stats
+
+    def draw_overlay(self, screen, refresh=30):
+        # The text is only re-rendered every refresh frames
+        if not self.enabled:
+            return
+        if self.font is None:
+            self.font = pygame.font.SysFont('monospace', 16)
+        if self._overlay is None or self.frames - self._overlay_frame >= refresh:
+            self._overlay = self._render_overlay(self.font)
+            self._overlay_frame = self.frames
+        screen.blit(self._overlay, (screen.get_width() - self._overlay.get_width() - 10, 10))
+
+    def _phase_lines(self, title, total):
+        # Percentile table, the whole frame last as total
+        lines = [f"{title:<12}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f"{total if name == 'frame' else name:<12}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        return lines
+
+    def _render_overlay(self, font):
+        lines = self._phase_lines('phase', 'frame')
+        if self.ticks is not None and self.ticks.frames:
+            lines += self.ticks._phase_lines('sim thread', 'tick')
+        if self.frames:
+            row = (self.frames - 1) % self.history
+            counts = [f"{name} {self.counts[row, i]}" for i, name in enumerate(self.count_names)]
+            for start in range(0, len(counts), 4):
+                lines.append("  ".join(counts[start:start + 4]))
+        images = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(image.get_width() for image in images) + 12
+        height = sum(image.get_height() for image in images) + 12
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        y = 6
+        for image in images:
+            overlay.blit(image, (6, y))
+            y += image.get_height()
+        return overlay
+
+    def dump(self, path):
+        """Write the stored frames (ms per phase, then counts) as CSV, or JSONL for a .jsonl path."""
+        rows = self._recorded()
+        if len(rows) == 0:
+            return False
+        first = self.frames - len(rows)
+        header = ['frame'] + self.phases + self.count_names
+        with open(path, 'w', newline='') as f:
+            writer = None if str(path).endswith('.jsonl') else csv.writer(f)
+            if writer:
+                writer.writerow(header)
+            for i, row in enumerate(rows):
+                values = [first + i]
+                values += (self.samples[row, :len(self.phases)] * 1000).round(4).tolist()
+                values += self.counts[row, :len(self.count_names)].tolist()
+                if writer:
+                    writer.writerow(values)
+                else:
+                    f.write(json.dumps(dict(zip(header, values))) + "\n")
+        return True
+
+# One profiler for the whole game; F3 toggles it in play
+profiler = FrameProfiler()
@@ -0,0 +1,109 @@
+"""
+Input recordings: a round's seed, view size, tick rate and spawn limits,
+then the TickInput of every tick, so the round can be played again tick for tick
+(see run_game.py --record / --replay and game.headless --replay).
+
+The file is a header, then one byte per tick: bits 0-1 move, bits 2-3 turn
+(0 none, 1 forward / left, 2 back / right), bits 4-7 the shots fired that
+tick. 15 shots or more store 15 there and the count in the next byte.
+"""
+import atexit
+import struct
+from collections import namedtuple
+from .simulation import TickInput, IDLE, TICK_RATE
+
+MAGIC = b'HREC'
+VERSION = 2
+HEADER = struct.Struct('<4sBHHHQHH')  # magic, version, tick rate, width, height, seed, max tanks, spawn interval
+HEADER_V1 = struct.Struct('<4sBHHHQ')  # Version 1 had no spawn limits; they were fixed at 48 and 4
+MANY_SHOTS = 15
+
+_AXIS_BITS = {0: 0, 1: 1, -1: 2}
+_AXIS_VALUES = (0, 1, -1, 0)
+
+Recording = namedtuple('Recording', 'seed tick_rate width height max_tanks spawn_interval inputs')
+
+def encode_input(tick_input):
+    move, turn, fire = tick_input
+    shots = min(int(fire), 255)
+    bits = _AXIS_BITS[move] | _AXIS_BITS[turn] << 2 | min(shots, MANY_SHOTS) << 4
+    if shots >= MANY_SHOTS:
+        return bytes((bits, shots))
+    return bytes((bits,))
+
+def decode_inputs(data):
+    inputs = []
+    i = 0
+    while i < len(data):
+        bits = data[i]
+        shots = bits >> 4
+        if shots == MANY_SHOTS:
+            i += 1
+            shots = data[i]
+        inputs.append(TickInput(_AXIS_VALUES[bits & 3], _AXIS_VALUES[bits >> 2 & 3], shots))
+        i += 1
+    return inputs
+
+def load_recording(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER_V1.size or data[:4] != MAGIC:
+        raise ValueError(f"{path}: not an input recording")
+    version = data[4]
+    if version == 1:
+        header = HEADER_V1
+        _, _, tick_rate, width, height, seed = header.unpack_from(data)
+        max_tanks, spawn_interval = 48, 4
+    elif version == VERSION:
+        header = HEADER
+        if len(data) < header.size:
+            raise ValueError(f"{path}: not an input recording")
+        _, _, tick_rate, width, height, seed, max_tanks, spawn_interval = header.unpack_from(data)
+    else:
+        raise ValueError(f"{path}: recording version {version} is not supported")
+    if tick_rate != TICK_RATE:
+        raise ValueError(f"{path}: recorded at {tick_rate} ticks per second, the game runs at {TICK_RATE}")
+    return Recording(seed, tick_rate, width, height, max_tanks, spawn_interval, decode_inputs(data[header.size:]))
+
+class InputRecorder:
+    """
+    Writes the inputs of one Simulation's ticks to path as they happen (set
+    it as the simulation's recorder). Flushed once per second of ticks, and
+    closed on close() or at exit at the latest, so a crash loses at most
+    the last second.
+    """
+    def __init__(self, path, seed, width, height, max_tanks, spawn_interval):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, TICK_RATE, width, height, seed, max_tanks, spawn_interval))
+        self.flush_every = TICK_RATE
+        self.ticks = 0
+        atexit.register(self.close)
+
+    def record(self, tick_input):
+        if self.file.closed:
+            return  # A worker thread may tick on after the game has quit
+        self.file.write(encode_input(tick_input))
+        self.ticks += 1
+        if self.ticks % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        atexit.unregister(self.close)
+        self.file.close()
+
+class Playback:
+    """A Recording's inputs, one per tick; IDLE once they have run out."""
+    def __init__(self, recording):
+        self.recording = recording
+        self.tick = 0
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.recording.inputs)
+
+    def next_input(self):
+        if self.finished:
+            return IDLE
+        tick_input = self.recording.inputs[self.tick]
+        self.tick += 1
+        return tick_input
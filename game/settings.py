@@ -2,7 +2,6 @@ import json
 from pathlib import Path
 
 CONFIG_DIR = Path(__file__).parent.parent / "config"
-CONFIG_DIR.mkdir(exist_ok=True)
 SETTINGS_FILE = CONFIG_DIR / "settings.json"
 
 # Default settings
@@ -10,23 +9,42 @@ DEFAULT_SETTINGS = {
     "WIDTH": 800,
     "HEIGHT": 600,
     "FPS": 60,
-    "FULLSCREEN": True
+    "SIM_THREAD": False,
+    "MAX_TANKS": 48,
+    "SPAWN_INTERVAL": 4,
+    "FULLSCREEN": True,
+    "GROUND_CACHE_MB": 64,
+    "PROFILE_DUMP": "profile.csv"
 }
 
+_settings = None  # Loaded on first use, see get_settings()
+
 def load_settings():
+    # Read the file (writing the defaults if there is none)
     if SETTINGS_FILE.exists():
         with open(SETTINGS_FILE, 'r') as f:
             return json.load(f)
     else:
         save_settings(DEFAULT_SETTINGS)
-        return DEFAULT_SETTINGS
+        return dict(DEFAULT_SETTINGS)
 
 def save_settings(settings):
+    global _settings
+    CONFIG_DIR.mkdir(exist_ok=True)
     with open(SETTINGS_FILE, 'w') as f:
         json.dump(settings, f, indent=2)
+    _settings = dict(settings)
+
+def get_settings():
+    # The settings, read from disk once; save_settings() keeps them current.
+    # Returns a copy, so changes only stick through save_settings().
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return dict(_settings)
 
-settings = load_settings()
-WIDTH = settings.get("WIDTH", DEFAULT_SETTINGS["WIDTH"])
-HEIGHT = settings.get("HEIGHT", DEFAULT_SETTINGS["HEIGHT"])
-FPS = settings.get("FPS", DEFAULT_SETTINGS["FPS"])
-FULLSCREEN = settings.get("FULLSCREEN", DEFAULT_SETTINGS["FULLSCREEN"])
\ No newline at end of file
+def __getattr__(name):
+    # settings.WIDTH etc., looked up on first access rather than at import
+    if name in DEFAULT_SETTINGS:
+        return get_settings().get(name, DEFAULT_SETTINGS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,232 @@
+import math
+import random
+from collections import namedtuple
+import numpy as np
+import pygame
+from .player import Player, PlayerBullet
+from .enemy import EnemyField, explosion_frames
+from .spawn import SpawnDirector
+from .particles import ParticleSystem, render_circle
+from .profiler import profiler as shared_profiler
+from .snapshot import Snapshot, SpriteSnapshot
+
+# Game ticks per second. Speeds, cooldowns and timers all count ticks and are
+# tuned for this rate, so it is fixed rather than a setting
+TICK_RATE = 60
+
+# One tick of player input: move and turn are -1, 0 or 1 (forward / left
+# positive), fire is the number of shots fired this tick
+TickInput = namedtuple('TickInput', 'move turn fire', defaults=(0, 0, 0))
+IDLE = TickInput()
+
+# Something the frontend should react to (play a sound), at world position x, y
+SimEvent = namedtuple('SimEvent', 'kind x y')
+
+def input_from_keys(keys, fire=0):
+    move = 0
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        move = 1
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        move = -1
+    turn = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        turn += 1
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        turn -= 1
+    return TickInput(move, turn, fire)
+
+class Simulation:
+    """
+    One round of the game without the window: the player, tanks, bullets,
+    collisions, score and effects. step() advances one tick from a TickInput
+    and returns the SimEvents the frontend should react to ('fire',
+    'tank_fire', 'explosion', 'damage', 'crash'). All randomness comes from
+    generators seeded with seed, so the same seed and inputs always play out
+    the same round.
+    width and height are the view size; tanks and bullets react to it.
+
+    Ticks are fixed steps of 1/TICK_RATE seconds. Each entity keeps its
+    position from before the last tick (prev_*), so a renderer can draw
+    between ticks; snapshot() copies everything drawn into a Snapshot.
+    step() times its phases on profiler (the game's shared one unless given
+    another).
+
+    Destroyed tanks are replaced by a SpawnDirector, up to max_tanks at
+    once and at most one every spawn_interval ticks.
+
+    Without a seed one is picked at random and kept in self.seed, so any
+    round can be recorded; a recorder (see replay.InputRecorder) is handed
+    the input of every tick played.
+    """
+    def __init__(self, width, height, seed=None, profiler=None, max_tanks=48, spawn_interval=4):
+        self.width = width
+        self.height = height
+        self.profiler = profiler if profiler is not None else shared_profiler
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        self.recorder = None
+        self.player = Player(width // 2, height // 2)
+        self.player.world_x = 0
+        self.player.world_y = 0
+        self.player.prev_world_x = self.player.world_x
+        self.player.prev_world_y = self.player.world_y
+        self.player.prev_angle = self.player.angle
+        self.camera_x = self.player.world_x
+        self.camera_y = self.player.world_y
+        # All tanks live in one vectorized field; iterating it yields the tanks
+        self.enemies = EnemyField(rng=self.rng)
+        self.enemies.spawn(self.player.world_x, self.player.world_y)
+        self.spawner = SpawnDirector(self.enemies, max_tanks=max_tanks, interval=spawn_interval)
+        self.bullets = []
+        # Spark colours run (255, 180..220, 60); the frame index picks one
+        self.sparks = ParticleSystem([render_circle(3, (255, g, 60)) for g in range(180, 221)], capacity=2048, gravity=1.2)
+        self.explosions = ParticleSystem(explosion_frames(), capacity=1024)
+        self.tick = 0
+        self.score = 0
+        self.max_hearts = 5
+        self.hearts = self.max_hearts
+        self.game_over = False
+
+    def release(self):
+        # Hand the player's bullets back to the pool before dropping the round,
+        # and finish its recording
+        for bullet in self.bullets:
+            bullet.release()
+        self.bullets = []
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def fire(self):
+        player = self.player
+        bullet_length = player.player_width // 2
+        rad = math.radians(player.angle)
+        world_bullet_x = player.world_x + math.cos(rad) * bullet_length
+        world_bullet_y = player.world_y - math.sin(rad) * bullet_length
+        self.bullets.append(PlayerBullet.fire(world_bullet_x, world_bullet_y, player.angle))
+
+    def step(self, tick_input=IDLE):
+        """Advance one tick; returns the list of events it produced."""
+        events = []
+        if self.game_over:
+            return events
+        if self.recorder is not None:
+            self.recorder.record(tick_input)
+        self.tick += 1
+        player = self.player
+        lap = self.profiler.lap
+        player.prev_world_x = player.world_x
+        player.prev_world_y = player.world_y
+        player.prev_angle = player.angle
+        WIDTH, HEIGHT = self.width, self.height
+        for _ in range(int(tick_input.fire)):
+            self.fire()
+            events.append(SimEvent('fire', player.world_x, player.world_y))
+        # Movement from input (same rules as Player.update, but in world space)
+        if tick_input.move != 0:
+            player.speed += player.acceleration * tick_input.move
+        else:
+            player.speed *= 0.92
+        if player.speed > player.max_speed:
+            player.speed = player.max_speed
+        if player.speed < -player.max_speed:
+            player.speed = -player.max_speed
+        player.angle += player.rotation_speed * tick_input.turn
+        rad = math.radians(player.angle)
+        player.world_x += math.cos(rad) * player.speed
+        player.world_y += -math.sin(rad) * player.speed
+        player.spin()
+        # Camera always follows player
+        camera_x = self.camera_x = player.world_x
+        camera_y = self.camera_y = player.world_y
+        lap('player')
+        # Move particles spawned on earlier ticks
+        self.sparks.update()
+        self.explosions.update()
+        lap('effects')
+        # Update bullets in world space
+        bullets = self.bullets
+        for bullet in bullets[:]:
+            bullet.update()
+            screen_x = bullet.world_x - camera_x + WIDTH // 2
+            screen_y = bullet.world_y - camera_y + HEIGHT // 2
+            if (
+                screen_x < -100 or screen_x > WIDTH + 100 or
+                screen_y < -100 or screen_y > HEIGHT + 100
+            ):
+                bullets.remove(bullet)
+                bullet.release()
+        lap('bullet update')
+        # Update all enemies (tanks)
+        enemies = self.enemies
+        for tank in enemies.step(player.world_x, player.world_y, WIDTH, HEIGHT):
+            events.append(SimEvent('tank_fire', tank.world_x, tank.world_y))
+        lap('enemy update')
+        # --- Bullet-enemy collision (player bullets hit tank) ---
+        # All bullets are tested against the tank columns at once; a bullet
+        # is spent on the first tank it hits
+        hit = enemies.first_hits([tuple(bullet.get_world_rect()) for bullet in bullets])
+        for bullet, enemy in [(bullet, enemy) for bullet, enemy in zip(bullets, hit) if enemy is not None]:
+            bullets.remove(bullet)
+            bullet.release()
+            self.score += 1
+            events.append(SimEvent('explosion', enemy.world_x, enemy.world_y))
+            enemy.start_explode()
+            self.explosions.emit(enemy.world_x, enemy.world_y, life=len(self.explosions.frames), frame_step=1)
+            # When tank is hit, 2 new tanks come in outside radar (over the next ticks)
+            self.spawner.request(2)
+        # Remove exploded tanks after animation
+        enemies.advance_explosions()
+        # --- Tank bullet hits player ---
+        player_rect = pygame.Rect(player.world_x - player.player_width // 2, player.world_y - player.player_height // 2, player.player_width, player.player_height)
+        # Only armed tanks have bullets in flight; each is tested directly
+        hits = [(enemy, bullet) for enemy in enemies.armed for bullet in enemy.bullets
+                if bullet.get_world_rect().colliderect(player_rect)]
+        for enemy, bullet in hits:
+            enemy.bullets.remove(bullet)
+            self.hearts -= 1
+            events.append(SimEvent('damage', player.world_x, player.world_y))
+            # Spawn sparks
+            rng = self.np_rng
+            angle = rng.uniform(-0.7, 0.7, 12)
+            speed = rng.uniform(6, 13, 12)
+            self.sparks.emit(player.world_x, player.world_y - 10,
+                             np.cos(angle + math.pi/2) * speed, -np.abs(np.sin(angle + math.pi/2) * speed),
+                             life=rng.integers(10, 19, 12), frame=rng.integers(0, 41, 12))
+            if self.hearts <= 0:
+                self.game_over = True
+                events.append(SimEvent('crash', player.world_x, player.world_y))
+        lap('collisions')
+        # Replacement tanks, a few per tick
+        self.spawner.step(player.world_x, player.world_y, pause_time=TICK_RATE * 10)
+        lap('spawn')
+        return events
+
+    def snapshot(self):
+        """Copy of everything drawn, as of the latest tick."""
+        player = self.player
+        return Snapshot(self.tick, player.world_x, player.world_y, player.prev_world_x, player.prev_world_y,
+                        player.angle, player.prev_angle, player.speed, player.rotor_angle,
+                        self.score, self.hearts, self.game_over,
+                        self.enemies.snapshot(), SpriteSnapshot(self.bullets),
+                        self.sparks.snapshot(), self.explosions.snapshot())
+
+    def state(self):
+        """Summary of the round so far, plain data only."""
+        player = self.player
+        xs, ys = self.enemies.positions()
+        return {
+            'tick': self.tick,
+            'score': self.score,
+            'hearts': self.hearts,
+            'game_over': self.game_over,
+            'player': [player.world_x, player.world_y, player.angle, player.speed],
+            'tanks': len(self.enemies),
+            'tank_x_sum': float(xs.sum()),
+            'tank_y_sum': float(ys.sum()),
+            'bullets': len(self.bullets),
+            'tank_bullets': sum(len(tank.bullets) for tank in self.enemies.armed),
+            'particles': len(self.sparks) + len(self.explosions),
+        }
@@ -0,0 +1,68 @@
+from collections import namedtuple
+import numpy as np
+
+class SpriteSnapshot:
+    """
+    Frozen copy of some sprites (anything with world_x, world_y, prev_x,
+    prev_y and image), drawn centred on their positions like the sprites'
+    own draw(), skipping those out of view. Bullets are pooled and move
+    every tick; their snapshot doesn't.
+    """
+    def __init__(self, sprites):
+        self.images = [sprite.image for sprite in sprites]
+        self.sizes = np.array([image.get_size() for image in self.images], dtype=np.int64).reshape(-1, 2)
+        self.x = np.array([sprite.world_x for sprite in sprites], dtype=np.float64)
+        self.y = np.array([sprite.world_y for sprite in sprites], dtype=np.float64)
+        self.prev_x = np.array([sprite.prev_x for sprite in sprites], dtype=np.float64)
+        self.prev_y = np.array([sprite.prev_y for sprite in sprites], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.images)
+
+    def layout(self, camera_x, camera_y, WIDTH, HEIGHT, alpha=1.0, start=0, stop=None):
+        """Screen top left corners of sprites start:stop (arrays), and which of them are in view."""
+        x = self.x[start:stop]
+        y = self.y[start:stop]
+        x = x + (self.prev_x[start:stop] - x) * (1 - alpha)
+        y = y + (self.prev_y[start:stop] - y) * (1 - alpha)
+        # Truncate, then centre like Rect.center does
+        sizes = self.sizes[start:stop]
+        left = (x - camera_x + WIDTH // 2).astype(np.int64) - sizes[:, 0] // 2
+        top = (y - camera_y + HEIGHT // 2).astype(np.int64) - sizes[:, 1] // 2
+        in_view = (left < WIDTH) & (top < HEIGHT) & (left + sizes[:, 0] > 0) & (top + sizes[:, 1] > 0)
+        return left, top, in_view
+
+    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT, alpha=1.0, start=0, stop=None):
+        # Sprites start:stop in view, alpha of the way from the previous tick
+        # to the latest; returns how many were drawn
+        if len(self.x[start:stop]) == 0:
+            return 0
+        left, top, in_view = self.layout(camera_x, camera_y, WIDTH, HEIGHT, alpha, start, stop)
+        shown = np.flatnonzero(in_view)
+        images = self.images[start:stop]
+        screen.blits([(images[i], position) for i, position in zip(shown.tolist(), zip(left[shown].tolist(), top[shown].tolist()))], doreturn=False)
+        return len(shown)
+
+class Snapshot(namedtuple('Snapshot', 'tick player_x player_y prev_x prev_y angle prev_angle speed rotor_angle '
+                                      'score hearts game_over tanks bullets sparks explosions')):
+    """
+    Everything the renderer needs from one tick of a Simulation, copied out
+    of it (see Simulation.snapshot()), so it can be drawn while the
+    simulation moves on. tanks, bullets, sparks and explosions each have a
+    draw(screen, camera_x, camera_y, WIDTH, HEIGHT, alpha) that skips what
+    is out of view.
+    """
+    __slots__ = ()
+
+    def view(self, alpha=1.0):
+        """Player position and heading alpha of the way from the previous tick to the latest."""
+        back = 1 - alpha
+        return (self.player_x + (self.prev_x - self.player_x) * back,
+                self.player_y + (self.prev_y - self.player_y) * back,
+                self.angle + (self.prev_angle - self.angle) * back)
+
+    def counts(self):
+        # Entity counts, as the frame profiler records them
+        return {'tanks': len(self.tanks), 'tanks_simulated': self.tanks.simulated,
+                'bullets': len(self.bullets), 'tank_bullets': len(self.tanks.bullets),
+                'particles': len(self.sparks) + len(self.explosions)}
@@ -0,0 +1,68 @@
+import pygame
+
+class SpatialHash:
+    """
+    Uniform grid over world space for collision broadphase. Items are
+    registered with their world rect into every cell the rect touches; a query
+    only looks at the cells under the query rect and then runs the exact rect
+    test on those few candidates. Rebuild it once per tick with clear() and
+    insert().
+    """
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> [(item, rect), ...]
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.cells.values())
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        x, y, w, h = rect
+        return (int(x // size), int((x + max(w, 1) - 1) // size),
+                int(y // size), int((y + max(h, 1) - 1) // size))
+
+    def insert(self, item, rect):
+        rect = pygame.Rect(rect)
+        x0, x1, y0, y1 = self._cell_range(rect)
+        entry = (item, rect)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entry]
+                else:
+                    bucket.append(entry)
+
+    def insert_point(self, item, x, y):
+        # insert() for a 1x1 rect at x, y, which only ever touches one cell
+        size = self.cell_size
+        entry = (item, pygame.Rect(x, y, 1, 1))
+        bucket = self.cells.get((int(x // size), int(y // size)))
+        if bucket is None:
+            self.cells[(int(x // size), int(y // size))] = [entry]
+        else:
+            bucket.append(entry)
+
+    def query(self, rect):
+        # Items whose registered rect overlaps rect, each at most once
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self.cells
+        found = []
+        seen = None
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item, item_rect in bucket:
+                    if item_rect.colliderect(rect):
+                        if seen is None:
+                            seen = set()
+                        if id(item) not in seen:
+                            seen.add(id(item))
+                            found.append(item)
+        return found
@@ -0,0 +1,78 @@
+import math
+import numpy as np
+from .spatial import SpatialHash
+
+class SpawnDirector:
+    """
+    Places the tanks that replace destroyed ones. request() only queues
+    them; step() (once per tick) spawns at most per_tick of the queue, and
+    none within interval ticks of the last spawn, so a kill streak is spread
+    over the following ticks instead of landing on one. While the field
+    holds max_tanks tanks the queue waits (it never grows past max_tanks).
+
+    New tanks appear in a ring just outside the radar, at least separation
+    away from every tank and the player if one of tries random spots allows
+    it (else at the last spot tried). Nearby tanks are found on a grid of
+    the field, built on ticks that spawn.
+    """
+    def __init__(self, field, max_tanks=48, per_tick=1, interval=4, radar_radius=3600, separation=300, tries=20):
+        self.field = field
+        self.max_tanks = max_tanks
+        self.per_tick = per_tick
+        self.interval = interval
+        self.radar_radius = radar_radius
+        self.separation = separation
+        self.tries = tries
+        self.pending = 0
+        self.cooldown = 0  # Ticks until the next spawn is allowed
+        self.grid = SpatialHash(cell_size=separation)
+
+    def request(self, count=1):
+        self.pending = min(self.pending + count, self.max_tanks)
+
+    def step(self, player_world_x, player_world_y, pause_time=0):
+        """Spawn this tick's share of the queue; returns the new tanks."""
+        spawned = []
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        room = self.max_tanks - len(self.field)
+        count = min(self.pending, self.per_tick, room)
+        if count <= 0 or self.cooldown > 0:
+            return spawned
+        grid = self.grid
+        grid.clear()
+        # Positions are the grid's items. Only tanks
+        # within separation of the spawn ring can be in the way
+        grid.insert_point((player_world_x, player_world_y), player_world_x, player_world_y)
+        xs, ys = self.field.positions()
+        dist = np.hypot(xs - player_world_x, ys - player_world_y)
+        near = (dist > self.radar_radius + 200 - self.separation) & (dist < self.radar_radius + 400 + self.separation)
+        for x, y in zip(xs[near].tolist(), ys[near].tolist()):
+            grid.insert_point((x, y), x, y)
+        for _ in range(count):
+            x, y = self._place(player_world_x, player_world_y)
+            spawned.append(self.field.spawn(player_world_x, player_world_y, position=(x, y), pause_time=pause_time))
+            grid.insert_point((x, y), x, y)
+        self.pending -= count
+        self.cooldown = self.interval
+        return spawned
+
+    def _place(self, player_world_x, player_world_y):
+        rng = self.field.rng
+        separation = self.separation
+        dist = self.radar_radius + 200 + rng.uniform(0, 200)
+        for _ in range(self.tries):
+            angle = rng.uniform(0, 2 * math.pi)
+            x = player_world_x + math.cos(angle) * dist
+            y = player_world_y + math.sin(angle) * dist
+            if not self._crowded(x, y, separation):
+                break
+        return x, y
+
+    def _crowded(self, x, y, separation):
+        # Anything on the grid within separation of x, y?
+        area = (x - separation, y - separation, 2 * separation + 1, 2 * separation + 1)
+        for item_x, item_y in self.grid.query(area):
+            if math.hypot(x - item_x, y - item_y) <= separation:
+                return True
+        return False
@@ -0,0 +1,38 @@
+import sys
+import time
+
+class StartupProfile:
+    """
+    Wall-clock time of each startup phase, for --profile-startup. mark(name)
+    charges the time since the previous mark (or since this module was
+    imported) to name; report() prints the phases and the total once.
+    While disabled, mark() and report() do nothing.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+        self.reported = False
+
+    def enable(self):
+        self.enabled = True
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def report(self, title="first menu frame", file=None):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        file = file or sys.stderr
+        print(f"Startup to {title}:", file=file)
+        for name, seconds in self.phases:
+            print(f"  {name:<24}{seconds * 1000:>9.1f} ms", file=file)
+        print(f"  {'total':<24}{(self.last - self.start) * 1000:>9.1f} ms", file=file)
+
+# Imported first by run_game.py, so its clock starts with the game
+startup = StartupProfile()
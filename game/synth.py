@@ -0,0 +1,91 @@
+import pygame
+import numpy as np
+from functools import lru_cache
+
+# Shared building blocks for the procedural sound generators. Everything works
+# on whole NumPy arrays at once and ends in an int16 stereo buffer that
+# pygame.sndarray.make_sound can take as is.
+
+# PCG64 draws normals several times faster than the legacy global RandomState
+_default_rng = np.random.default_rng()
+
+def time_axis(duration, sample_rate=44100):
+    return np.linspace(0, duration, int(sample_rate * duration), False)
+
+def noise(scale, size, rng=None):
+    # Gaussian noise from rng (a numpy Generator) or the module's own generator
+    return (rng or _default_rng).normal(0, scale, size)
+
+@lru_cache(maxsize=None)
+def whump_envelope(length):
+    # Decay shared by every whump of the same length
+    envelope = np.exp(-np.linspace(0, 3, length))
+    envelope.flags.writeable = False
+    return envelope
+
+def stereo_buffer(n, out=None):
+    # A zeroed (n, 2) int16 buffer, reusing out when given
+    if out is None:
+        return np.zeros((n, 2), dtype=np.int16)
+    out[:n] = 0
+    return out[:n]
+
+def to_stereo_int16(wave, volume=1.0, out=None):
+    """
+    Scale a mono float wave to int16 and write it into both channels of out
+    (allocated if not given). wave is scaled in place.
+    """
+    if out is None:
+        out = np.empty((len(wave), 2), dtype=np.int16)
+    wave *= 32767 * volume
+    np.copyto(out[:, 0], wave, casting='unsafe')
+    out[:, 1] = out[:, 0]
+    return out
+
+def whump_train(duration, whumps_per_sec, freq, volume=1.0, sample_rate=44100, whump_len=0.07, rng=None, out=None):
+    """
+    Repeating low thumps (sine + noise under a decaying envelope), peak
+    normalized and scaled by volume, as an int16 stereo buffer. All whumps are
+    synthesized as one (whumps x length) block and written through a strided
+    view of the output; samples between whumps are never computed.
+    """
+    n = int(sample_rate * duration)
+    step = duration / n  # seconds per sample, as in time_axis
+    interval = int(sample_rate / whumps_per_sec)
+    length = min(int(sample_rate * whump_len), n)
+    starts = np.arange(0, n, interval)
+    full = int(np.count_nonzero(starts + length <= n))
+    blocks = []  # (first sample, whump samples)
+    if full:
+        idx = starts[:full, None] + np.arange(length)
+        block = np.sin((2 * np.pi * freq * step) * idx)
+        block *= 0.7
+        block += 0.3 * noise(0.7, block.shape, rng)
+        block *= whump_envelope(length)
+        blocks.append((starts[:full], block))
+    # A whump cut off by the end of the buffer decays over what's left of it
+    for i in starts[full:]:
+        whump = 0.7 * np.sin((2 * np.pi * freq * step) * np.arange(i, n))
+        whump += 0.3 * noise(0.7, n - i, rng)
+        whump *= np.exp(-np.linspace(0, 3, n - i))
+        blocks.append((np.array([i]), whump[None, :]))
+    buffer = stereo_buffer(n, out)
+    if interval < length:
+        # Overlapping whumps have to be summed before normalizing
+        pulse = np.zeros(n)
+        for first, block in blocks:
+            np.add.at(pulse, first[:, None] + np.arange(block.shape[1]), block)
+        return to_stereo_int16(pulse / (np.max(np.abs(pulse)) + 1e-6), volume, buffer)
+    scale = 32767 * volume / (max(np.max(np.abs(block)) for _, block in blocks) + 1e-6)
+    for first, block in blocks:
+        block *= scale
+        # Row k of this view starts at sample first[k]; whumps are evenly spaced
+        rows = np.lib.stride_tricks.as_strided(
+            buffer[first[0]:], shape=(len(first),) + block.shape[1:] + (2,),
+            strides=(interval * buffer.strides[0],) + buffer.strides)
+        np.copyto(rows[..., 0], block, casting='unsafe')
+        rows[..., 1] = rows[..., 0]
+    return buffer
+
+def make_sound(samples):
+    return pygame.sndarray.make_sound(samples)
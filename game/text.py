@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import pygame
+
+class TextCache:
+    """
+    Rendered strings, keyed by font, text and colour, so labels that are
+    drawn every frame are only rendered once. Least recently used entries
+    are dropped past max_entries. Returned surfaces are shared: blit them,
+    don't draw on them.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        image = self.entries.get(key)
+        if image is None:
+            image = font.render(text, antialias, color)
+            self.entries[key] = image
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return image
+
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    # Drop-in for font.render(text, antialias, color), through the shared cache
+    return text_cache.render(font, text, color, antialias)
+
+class Hud:
+    """
+    Score and hearts, kept in one layer that is only redrawn when the score
+    or the number of hearts changes.
+    """
+    def __init__(self, font, max_hearts=5):
+        self.font = font
+        self.max_hearts = max_hearts
+        self.heart_img = pygame.Surface((32, 32), pygame.SRCALPHA)
+        pygame.draw.polygon(self.heart_img, (255, 60, 60), [(16, 28), (2, 14), (8, 4), (16, 10), (24, 4), (30, 14)])
+        self.layer = None
+        self.shown = None  # (score, hearts) in the layer
+
+    def _render(self, score, hearts):
+        score_text = render_text(self.font, f"Score: {score}", (255, 255, 255))
+        width = max(10 + score_text.get_width(), 20 + self.max_hearts * 38)
+        layer = pygame.Surface((width, 54 + 32), pygame.SRCALPHA)
+        # Nothing in the layer overlaps, so copy pixels as they are instead of
+        # blending them onto the transparent layer
+        layer.blit(score_text, (10, 10), special_flags=pygame.BLEND_RGBA_MAX)
+        for i in range(self.max_hearts):
+            x = 20 + i * 38
+            y = 54
+            if i < hearts:
+                layer.blit(self.heart_img, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            else:
+                pygame.draw.polygon(layer, (120, 120, 120), [(x+16, y+28), (x+2, y+14), (x+8, y+4), (x+16, y+10), (x+24, y+4), (x+30, y+14)], 2)
+        return layer
+
+    def draw(self, screen, score, hearts):
+        if self.shown != (score, hearts):
+            self.layer = self._render(score, hearts)
+            self.shown = (score, hearts)
+        screen.blit(self.layer, (0, 0))
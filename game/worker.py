@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import deque
+from .profiler import FrameProfiler, profiler as shared_profiler
+from .simulation import IDLE, TICK_RATE
+
+class SimulationWorker:
+    """
+    Runs a Simulation on a background thread, ticking at its tick rate on its
+    own clock, so a slow tick no longer holds up drawing and flipping the
+    frame (and the other way round). After every tick it publishes a fresh
+    Snapshot; the render thread reads the latest one with latest() and must
+    not touch the simulation itself while the worker runs.
+
+    Publishing swaps one reference to a snapshot nobody writes to again, so
+    the renderer always sees a whole tick and never waits on the worker.
+
+    Given a replay.Playback as inputs, ticks take their input from it rather
+    than from feed(), and stop when it runs out.
+
+    Ticks are timed by a profiler of their own, on whenever the shared one
+    is, and shown in its overlay (shared profiler.ticks).
+    """
+    def __init__(self, sim, max_catch_up=0.25, inputs=None):
+        self.sim = sim
+        self.inputs = inputs
+        # The shared profiler times the render thread's frame; ticks get their own
+        self.profiler = sim.profiler = FrameProfiler(history=shared_profiler.history)
+        shared_profiler.ticks = self.profiler
+        self.tick_time = 1.0 / TICK_RATE
+        self.max_catch_up = max_catch_up
+        self._input = IDLE
+        self._input_lock = threading.Lock()
+        self._events = deque()
+        self._latest = (sim.snapshot(), time.perf_counter())  # (snapshot, when its tick was due)
+        self._paused = False
+        self._stopped = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def feed(self, tick_input):
+        # Steering for the coming ticks; shots add up until a tick takes them
+        with self._input_lock:
+            self._input = tick_input._replace(fire=self._input.fire + tick_input.fire)
+
+    def events(self):
+        """Events from the ticks run since the last call."""
+        events = []
+        while self._events:
+            events.extend(self._events.popleft())
+        return events
+
+    def latest(self):
+        """(latest snapshot, how far into the next tick we are, 0..1)."""
+        snapshot, due = self._latest
+        alpha = (time.perf_counter() - due) / self.tick_time
+        return snapshot, min(max(alpha, 0.0), 1.0)
+
+    def pause(self):
+        self._paused = True
+        self._wake.set()
+
+    def resume(self):
+        # The time spent paused is not caught up on
+        self._paused = False
+        self._wake.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        if shared_profiler.ticks is self.profiler:
+            shared_profiler.ticks = None
+
+    def _run(self):
+        sim = self.sim
+        profiler = self.profiler
+        due = time.perf_counter()  # When the next tick is due
+        while not self._stopped:
+            if self._paused or sim.game_over or (self.inputs is not None and self.inputs.finished):
+                self._wake.wait()
+                self._wake.clear()
+                due = time.perf_counter()
+                continue
+            now = time.perf_counter()
+            if now < due:
+                self._wake.wait(due - now)
+                self._wake.clear()
+                continue
+            # Too far behind: drop the backlog rather than spiral
+            due = max(due, now - self.max_catch_up)
+            if self.inputs is not None:
+                tick_input = self.inputs.next_input()
+            else:
+                with self._input_lock:
+                    tick_input = self._input
+                    self._input = tick_input._replace(fire=0)
+            if profiler.enabled != shared_profiler.enabled:
+                profiler.set_enabled(shared_profiler.enabled)  # F3 was pressed
+            profiler.begin_frame()
+            events = sim.step(tick_input)
+            snapshot = sim.snapshot()
+            profiler.lap('snapshot')
+            profiler.end_frame()
+            self._latest = (snapshot, due)
+            if events:
+                self._events.append(events)
+            due += self.tick_time
@@ -1,69 +1,265 @@
 import pygame
 import random
+import math
+from collections import OrderedDict
+import numpy as np
+from .assets import for_display
 
-def draw_ground_and_trees(screen, camera_x, camera_y, WIDTH, HEIGHT):
-    # Low-res ground: large tiles for smooth motion
-    tile_size = 160  # Much larger for smooth, slow-moving ground
-    start_x = int((camera_x - WIDTH // 2) // tile_size) * tile_size
-    start_y = int((camera_y - HEIGHT // 2) // tile_size) * tile_size
-    end_x = int((camera_x + WIDTH // 2) // tile_size) * tile_size + tile_size
-    end_y = int((camera_y + HEIGHT // 2) // tile_size) * tile_size + tile_size
-    grass_color = (34, 139, 34)
-    for wx in range(start_x, end_x, tile_size):
-        for wy in range(start_y, end_y, tile_size):
+TILE_SIZE = 160  # Much larger for smooth, slow-moving ground
+GRASS_COLOR = (34, 139, 34)
+# Tufts grow upward from their base and can poke this far into the tile above
+TUFT_OVERHANG = 12
+_OVERHANG_COLORKEY = (255, 0, 255)
+
+def _draw_tile_tufts(surface, sx, sy, tx, ty, tile_size=TILE_SIZE):
+    # Draw a few tufts of grass per tile (deterministic); returns the tile-local
+    # x of every 2px-wide blade
+    blades = []
+    seed = (tx * 92821 + ty * 68917) & 0xFFFFFFFF
+    rng = random.Random(seed)
+    for _ in range(4):
+        gx = sx + rng.randint(10, tile_size - 10)
+        gy = sy + rng.randint(10, tile_size - 10)
+        length = rng.randint(10, 18)
+        y2 = int(gy - length)
+        pygame.draw.line(surface, (60, 180, 60), (gx, gy), (gx, y2), 2)
+        blades.append(gx - sx)
+        if rng.random() < 0.7:
+            offset = rng.randint(-3, 3)
+            pygame.draw.line(surface, (80, 200, 80), (gx + offset, gy), (gx + offset, y2 + rng.randint(-2, 2)), 1)
+    return blades
+
+def _draw_tiles(screen, camera_x, camera_y, WIDTH, HEIGHT, xs, ys, tile_size=TILE_SIZE):
+    # Draw tiles one by one straight onto the screen
+    for wx in xs:
+        for wy in ys:
             sx = int(wx - camera_x + WIDTH // 2)
             sy = int(wy - camera_y + HEIGHT // 2)
-            pygame.draw.rect(screen, grass_color, (sx, sy, tile_size, tile_size))
-            # Draw a few tufts of grass per tile (deterministic)
-            tx = wx // tile_size
-            ty = wy // tile_size
-            seed = (tx * 92821 + ty * 68917) & 0xFFFFFFFF
-            rng = random.Random(seed)
-            for _ in range(4):
-                gx = sx + rng.randint(10, tile_size - 10)
-                gy = sy + rng.randint(10, tile_size - 10)
-                length = rng.randint(10, 18)
-                y2 = int(gy - length)
-                pygame.draw.line(screen, (60, 180, 60), (gx, gy), (gx, y2), 2)
-                if rng.random() < 0.7:
-                    offset = rng.randint(-3, 3)
-                    pygame.draw.line(screen, (80, 200, 80), (gx + offset, gy), (gx + offset, y2 + rng.randint(-2, 2)), 1)
+            pygame.draw.rect(screen, GRASS_COLOR, (sx, sy, tile_size, tile_size))
+            _draw_tile_tufts(screen, sx, sy, wx // tile_size, wy // tile_size, tile_size)
+
+class GroundChunkCache:
+    """
+    LRU cache of pre-rendered ground chunks (chunk_tiles x chunk_tiles tiles each).
+    Each chunk keeps an opaque ground surface with every tile's tufts clipped to
+    its own tile, plus a colorkeyed strip per tile row holding the tufts that
+    poke into the row above, so composing the view reproduces the per-tile
+    draw order exactly.
+    """
+    def __init__(self, chunk_tiles=4, max_bytes=64 * 1024 * 1024, tile_size=TILE_SIZE):
+        self.chunk_tiles = chunk_tiles
+        self.tile_size = tile_size
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.chunks = OrderedDict()  # (cx, cy) -> (ground, overhang, blades, nbytes)
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self.chunks.clear()
+        self.used_bytes = 0
+
+    def get(self, cx, cy):
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        chunk = self._render_chunk(cx, cy)
+        self.chunks[key] = chunk
+        self.used_bytes += chunk[3]
+        self._evict()
+        return chunk
+
+    def _evict(self):
+        # Always keep the most recent chunk, even if it alone exceeds the budget
+        while self.used_bytes > self.max_bytes and len(self.chunks) > 1:
+            _, (_, _, _, nbytes) = self.chunks.popitem(last=False)
+            self.used_bytes -= nbytes
+
+    def _render_chunk(self, cx, cy):
+        n = self.chunk_tiles
+        ts = self.tile_size
+        span = n * ts
+        ground = for_display(pygame.Surface((span, span)), alpha=False)
+        overhang = for_display(pygame.Surface((span, n * TUFT_OVERHANG)), alpha=False)
+        ground.fill(GRASS_COLOR)
+        overhang.fill(_OVERHANG_COLORKEY)
+        blades = {}
+        for i in range(n):
+            for j in range(n):
+                tx = cx * n + i
+                ty = cy * n + j
+                lx = i * ts
+                ground.set_clip((lx, j * ts, ts, ts))
+                blades[tx, ty] = _draw_tile_tufts(ground, lx, j * ts, tx, ty, ts)
+                overhang.set_clip((lx, j * TUFT_OVERHANG, ts, TUFT_OVERHANG))
+                _draw_tile_tufts(overhang, lx, (j + 1) * TUFT_OVERHANG, tx, ty, ts)
+        ground.set_clip(None)
+        overhang.set_clip(None)
+        overhang.set_colorkey(_OVERHANG_COLORKEY, pygame.RLEACCEL)
+        nbytes = ground.get_bytesize() * span * span + overhang.get_bytesize() * span * n * TUFT_OVERHANG
+        return ground, overhang, blades, nbytes
+
+    def draw(self, screen, camera_x, camera_y, WIDTH, HEIGHT):
+        ts = self.tile_size
+        n = self.chunk_tiles
+        span = n * ts
+        start_x = int((camera_x - WIDTH // 2) // ts) * ts
+        start_y = int((camera_y - HEIGHT // 2) // ts) * ts
+        end_x = int((camera_x + WIDTH // 2) // ts) * ts + ts
+        end_y = int((camera_y + HEIGHT // 2) // ts) * ts + ts
+        # Tiles are placed with int(), which rounds the partially visible first
+        # row/column (negative screen coords) up by a pixel; keep that nudge.
+        first_x = start_x - camera_x + WIDTH // 2
+        first_y = start_y - camera_y + HEIGHT // 2
+        base_x = math.floor(first_x)
+        base_y = math.floor(first_y)
+        nudge_x = int(first_x) - base_x
+        nudge_y = int(first_y) - base_y
+        off_x = base_x - start_x  # world -> screen offset for floor-aligned tiles
+        off_y = base_y - start_y
+        # Tiles stop at end_x/end_y, which can leave the last pixel row/column of
+        # an odd-sized screen untouched; the row below end_y's overhanging
+        # tufts are never drawn either.
+        right = min(WIDTH, end_x + off_x)
+        bottom = min(HEIGHT, end_y + off_y)
+        cols = [(0, base_x + ts, nudge_x), (base_x + ts, right, 0)] if nudge_x else [(0, right, 0)]
+        rows = [(0, base_y + ts, nudge_y), (base_y + ts, bottom, 0)] if nudge_y else [(0, bottom, 0)]
+        overhang_bottom = min(bottom, end_y + off_y - TUFT_OVERHANG)
+        chunks = []
+        for cx in range((-off_x - 1) // span, (WIDTH - off_x) // span + 1):
+            for cy in range((-off_y - 1) // span, (HEIGHT - off_y + TUFT_OVERHANG) // span + 1):
+                ground, overhang, _, _ = self.get(cx, cy)
+                chunks.append((cx * span + off_x, cy * span + off_y, ground, overhang))
+        prev_clip = screen.get_clip()
+        for x0, x1, dx in cols:
+            for y0, y1, dy in rows:
+                clip = pygame.Rect(x0, y0, x1 - x0, y1 - y0).clip(prev_clip)
+                if not clip:
+                    continue
+                screen.set_clip(clip)
+                screen.blits([(ground, (x + dx, y + dy)) for x, y, ground, _ in chunks
+                              if clip.colliderect((x + dx, y + dy, span, span))], doreturn=False)
+            clip = pygame.Rect(x0, 0, x1 - x0, overhang_bottom).clip(prev_clip)
+            if not clip:
+                continue
+            screen.set_clip(clip)
+            strips = []
+            for x, y, _, overhang in chunks:
+                for j in range(n):
+                    dest = (x + dx, y + j * ts - TUFT_OVERHANG)
+                    if clip.colliderect(dest + (span, TUFT_OVERHANG)):
+                        strips.append((overhang, dest, (0, j * TUFT_OVERHANG, span, TUFT_OVERHANG)))
+            screen.blits(strips, doreturn=False)
+        # pygame drops the on-screen half of a 2px blade that starts at x=-1,
+        # so when the first column has one there, redo the edge pixel column
+        # tile by tile to match.
+        edge_x = -1 - int(first_x)
+        tx = start_x // ts
+        ys = range(start_y, end_y, ts)
+        if any(edge_x in self.get(tx // n, (wy // ts) // n)[2][tx, wy // ts] for wy in ys):
+            screen.set_clip(pygame.Rect(0, 0, 1, HEIGHT).clip(prev_clip))
+            _draw_tiles(screen, camera_x, camera_y, WIDTH, HEIGHT, (start_x, start_x + ts), ys, ts)
+        screen.set_clip(prev_clip)
+
+ground_cache = GroundChunkCache()
+
+def draw_ground_and_trees(screen, camera_x, camera_y, WIDTH, HEIGHT):
+    # Low-res ground: large tiles for smooth motion, composed from cached chunks
+    ground_cache.draw(screen, camera_x, camera_y, WIDTH, HEIGHT)
     # No trees for this field view
 
+# Radar settings
+RADAR_RADIUS = 100
+RADAR_RANGE = 3600  # Double the previous range for offscreen detection
+RADAR_OUTLINE = (80, 200, 80)
+RADAR_ENEMY = (255, 60, 60)
+
+# Above this many tanks in range, one raster of all blips beats blitting each
+RADAR_RASTER_BLIPS = 400
+
+# Display size -> (radar chrome, enemy blip, flipped blip mask); the chrome is
+# the background, outline, crosshairs, player dot and shadow, none of which
+# ever change
+_radar_layers = {}
+
+def _render_radar_chrome(radar_radius=RADAR_RADIUS):
+    # Opaque pixels only, on a colorkey background (much cheaper to blit than alpha)
+    size = 2 * (radar_radius + 5)
+    center = (size // 2, size // 2)
+    image = pygame.Surface((size, size))
+    image.fill(_OVERHANG_COLORKEY)
+    image.set_colorkey(_OVERHANG_COLORKEY, pygame.RLEACCEL)
+    pygame.draw.circle(image, (20, 40, 20), center, radar_radius)
+    pygame.draw.circle(image, RADAR_OUTLINE, center, radar_radius, 2)
+    # Crosshairs
+    pygame.draw.line(image, RADAR_OUTLINE, (center[0] - radar_radius, center[1]), (center[0] + radar_radius, center[1]), 1)
+    pygame.draw.line(image, RADAR_OUTLINE, (center[0], center[1] - radar_radius), (center[0], center[1] + radar_radius), 1)
+    # Player at center
+    pygame.draw.circle(image, (255, 255, 0), center, 7)
+    # Border shadow; blips are clamped well inside it, so it can go under them
+    pygame.draw.circle(image, (0, 0, 0), center, radar_radius + 4, 4)
+    return image
+
+def _radar_layer(WIDTH, HEIGHT):
+    layers = _radar_layers.get((WIDTH, HEIGHT))
+    if layers is None:
+        chrome = _render_radar_chrome()
+        blip = pygame.Surface((14, 14), pygame.SRCALPHA)
+        pygame.draw.circle(blip, RADAR_ENEMY, (7, 7), 6)
+        # Mask.convolve with the mirrored blip stamps a blip on every set bit
+        stamp = pygame.mask.from_surface(pygame.transform.flip(blip, True, True))
+        chrome = for_display(chrome, alpha=False)
+        blip = for_display(blip)
+        _radar_layers.clear()  # Only the current resolution is worth keeping
+        layers = _radar_layers[(WIDTH, HEIGHT)] = (chrome, blip, stamp)
+    return layers
+
+def radar_offsets(dx, dy, radar_radius=RADAR_RADIUS, max_radar_dist=RADAR_RANGE):
+    """
+    Integer radar offsets for enemies at world offsets dx, dy (arrays) from
+    the player. Enemies out of range are dropped and ones near the rim are
+    pulled in to it.
+    """
+    in_range = dx * dx + dy * dy < max_radar_dist * max_radar_dist
+    # Convert world offset to radar offset
+    radar_dx = np.trunc(dx[in_range] / max_radar_dist * radar_radius)
+    radar_dy = np.trunc(dy[in_range] / max_radar_dist * radar_radius)
+    # Clamp to radar edge if outside
+    mag = np.sqrt(radar_dx ** 2 + radar_dy ** 2)
+    outside = mag > radar_radius - 8
+    scale = (radar_radius - 8) / mag[outside]
+    radar_dx[outside] = np.trunc(radar_dx[outside] * scale)
+    radar_dy[outside] = np.trunc(radar_dy[outside] * scale)
+    return radar_dx.astype(np.intp), radar_dy.astype(np.intp)
+
 def draw_radar(screen, player_world_x, player_world_y, enemies, WIDTH, HEIGHT):
-    # Radar settings
-    radar_radius = 100
-    radar_center = (radar_radius + 24, HEIGHT - radar_radius - 24)
-    radar_bg = (20, 40, 20)
-    radar_outline = (80, 200, 80)
-    radar_enemy = (255, 60, 60)
-    radar_player = (255, 255, 0)
-    max_radar_dist = 3600  # Double the previous range for offscreen detection
-    # Draw radar background
-    pygame.draw.circle(screen, radar_bg, radar_center, radar_radius)
-    pygame.draw.circle(screen, radar_outline, radar_center, radar_radius, 2)
-    # Draw crosshairs
-    pygame.draw.line(screen, radar_outline, (radar_center[0] - radar_radius, radar_center[1]), (radar_center[0] + radar_radius, radar_center[1]), 1)
-    pygame.draw.line(screen, radar_outline, (radar_center[0], radar_center[1] - radar_radius), (radar_center[0], radar_center[1] + radar_radius), 1)
-    # Draw player at center
-    pygame.draw.circle(screen, radar_player, radar_center, 7)
+    # enemies is an EnemyField (anything with positions() -> x and y arrays)
+    radar_center = (RADAR_RADIUS + 24, HEIGHT - RADAR_RADIUS - 24)
+    chrome, blip, stamp = _radar_layer(WIDTH, HEIGHT)
+    screen.blit(chrome, (radar_center[0] - chrome.get_width() // 2, radar_center[1] - chrome.get_height() // 2))
     # Draw enemies (including offscreen, clipped to radar edge if needed)
-    for enemy in enemies:
-        dx = enemy.world_x - player_world_x
-        dy = enemy.world_y - player_world_y
-        dist = (dx ** 2 + dy ** 2) ** 0.5
-        if dist < max_radar_dist:
-            # Convert world offset to radar offset
-            radar_dx = int(dx / max_radar_dist * radar_radius)
-            radar_dy = int(dy / max_radar_dist * radar_radius)
-            # Clamp to radar edge if outside
-            mag = (radar_dx ** 2 + radar_dy ** 2) ** 0.5
-            if mag > radar_radius - 8:
-                scale = (radar_radius - 8) / mag
-                radar_dx = int(radar_dx * scale)
-                radar_dy = int(radar_dy * scale)
-            ex = radar_center[0] + radar_dx
-            ey = radar_center[1] + radar_dy
-            pygame.draw.circle(screen, radar_enemy, (ex, ey), 6)
-    # Optional: add a border shadow
-    pygame.draw.circle(screen, (0,0,0), radar_center, radar_radius+4, 4)
\ No newline at end of file
+    xs, ys = enemies.positions()
+    if len(xs) == 0:
+        return
+    radar_dx, radar_dy = radar_offsets(xs - player_world_x, ys - player_world_y)
+    radar_dx += RADAR_RADIUS  # From here on, relative to the radar's top left
+    radar_dy += RADAR_RADIUS
+    side = 2 * RADAR_RADIUS + 1
+    left = radar_center[0] - RADAR_RADIUS - 7
+    top = radar_center[1] - RADAR_RADIUS - 7
+    if len(radar_dx) <= RADAR_RASTER_BLIPS:
+        # Tanks on the same radar pixel share a blip
+        blip_x, blip_y = np.divmod(np.unique(radar_dx * side + radar_dy), side)
+        screen.blits([(blip, position) for position in zip((blip_x + left).tolist(), (blip_y + top).tolist())], doreturn=False)
+    else:
+        # Crowded radar: stamp every blip into one mask and blit that once
+        grid = np.zeros((side, side), dtype=np.uint8)
+        grid[radar_dx, radar_dy] = 1
+        occupied = pygame.surfarray.make_surface(grid)
+        occupied.set_colorkey(0)
+        blips = pygame.mask.from_surface(occupied).convolve(stamp)
+        screen.blit(blips.to_surface(setcolor=RADAR_ENEMY + (255,), unsetcolor=(0, 0, 0, 0)), (left, top))
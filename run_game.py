@@ -1,4 +1,25 @@
-from game.main import run
+import argparse
+import importlib
+from game.startup import startup
+
+def main():
+    parser = argparse.ArgumentParser(description="Helicopter game.")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print how long each startup phase takes, up to the first menu frame")
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument('--record', metavar='FILE',
+                           help="record each round's seed and inputs to FILE (the latest round is kept)")
+    recording.add_argument('--replay', metavar='FILE',
+                           help="play back the round recorded in FILE, then exit")
+    args = parser.parse_args()
+    if args.profile_startup:
+        startup.enable()
+    # pygame first, so its import time is reported on its own
+    importlib.import_module('pygame')
+    startup.mark('import pygame')
+    from game.main import run
+    startup.mark('import game')
+    run(record=args.record, replay=args.replay)
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    main()